@@ -0,0 +1,71 @@
+"""Benchmark system-message classification in the message loader.
+
+Compares the single-scan SYSTEM_MESSAGES classifier with the previous
+approach (lowercase, then two any() scans over the phrase lists) on a
+synthetic 1M-message chat.
+
+    python benchmarks/bench_classifier.py [message_count]
+"""
+
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from groupchat_wrapped.parser import SYSTEM_MESSAGES, SYSTEM_MESSAGE_PHRASES
+
+
+WORDS = (
+    "dom piwo kawa impreza czas problem pizza telefon xD xddd haha ok gdzie "
+    "jest spotkanie jutro grupa group zdjęcie nazwa changed the named 😂 🎉"
+).split()
+
+
+def classify_with_scans(content: str) -> str:
+    """The per-message classification the loader used before."""
+    lower_content = content.lower()
+    if any(phrase in lower_content for phrase in SYSTEM_MESSAGE_PHRASES["name_change"]):
+        return "name_change"
+    elif any(phrase in lower_content for phrase in SYSTEM_MESSAGE_PHRASES["photo_change"]):
+        return "photo_change"
+    return "text"
+
+
+def classify_with_pattern(content: str) -> str:
+    return SYSTEM_MESSAGES.classify(content) or "text"
+
+
+def make_messages(count: int) -> list[str]:
+    rng = random.Random(0)
+    phrases = [phrase for type_phrases in SYSTEM_MESSAGE_PHRASES.values() for phrase in type_phrases]
+    messages = []
+    for _ in range(count):
+        if rng.random() < 0.001:
+            messages.append(f"Ania {rng.choice(phrases)} Ekipa")
+        else:
+            messages.append(" ".join(rng.choice(WORDS) for _ in range(rng.randint(1, 15))))
+    return messages
+
+
+def run(name: str, classify, messages: list[str]) -> tuple[float, list[str]]:
+    start = time.perf_counter()
+    types = [classify(content) for content in messages]
+    elapsed = time.perf_counter() - start
+    print(f"{name:<14} {elapsed:7.3f} s  {elapsed / len(messages) * 1e9:7.0f} ns/message")
+    return elapsed, types
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    messages = make_messages(count)
+    print(f"Classifying {count:,} messages")
+    before, expected = run("any() scans", classify_with_scans, messages)
+    after, actual = run("single scan", classify_with_pattern, messages)
+    assert actual == expected, "classifiers disagree"
+    print(f"Speedup: {before / after:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
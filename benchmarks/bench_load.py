@@ -0,0 +1,126 @@
+"""Benchmark repairing Facebook's mojibake while loading a message file.
+
+Writes a synthetic, Polish-heavy message_1.json (every UTF-8 byte escaped
+as \\u00XX, like Facebook does) and compares the two ways of repairing it:
+rewriting each escape run in the raw JSON text before decoding (the
+previous approach), and decoding first, then repairing only the strings the
+loader keeps with decode_facebook_encoding. The full load_conversation time
+is printed for reference. First, it checks that the streaming reader decodes
+a header with numbers at every chunk size, whatever boundary splits them.
+
+    python benchmarks/bench_load.py [message_count]
+"""
+
+import io
+import json
+import random
+import re
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from groupchat_wrapped.parser import _JsonStream, decode_facebook_encoding, decode_facebook_value, load_conversation
+
+
+WORDS = (
+    "cześć jutro spotkanie gdzie idziemy piwo wódka żółć źdźbło łódź ćma "
+    "dziękuję proszę świetnie zażółć gęślą jaźń haha ok xD 😂 🎉 ❤️ no"
+).split()
+NAMES = ["Łukasz Żółkiewski", "Małgorzata Wąs", "Paweł Ślęzak", "Zoë Krüger", "Jan Kowalski"]
+REACTIONS = ["😂", "❤️", "👍", "😮"]
+
+# The previous repair: escape runs in the raw JSON text, not after an escaped backslash
+RAW_RUN = re.compile(r'(?<!\\)((?:\\\\)*)(\\u00[89a-fA-F][0-9a-fA-F](?:\\u00[89a-fA-F][0-9a-fA-F])*)')
+
+
+def repair_raw_run(match: re.Match) -> str:
+    backslashes, run = match.groups()
+    data = bytes.fromhex("".join(run[i + 4:i + 6] for i in range(0, len(run), 6)))
+    try:
+        return backslashes + data.decode('utf-8')
+    except UnicodeDecodeError:
+        return match.group(0)
+
+
+def mojibake(text: str) -> str:
+    return text.encode('utf-8').decode('latin-1')
+
+
+def write_export(folder: Path, count: int) -> Path:
+    rng = random.Random(0)
+    messages = []
+    timestamp_ms = 1_700_000_000_000
+    for _ in range(count):
+        timestamp_ms -= rng.randint(1_000, 600_000)
+        message = {
+            "sender_name": mojibake(rng.choice(NAMES)),
+            "timestamp_ms": timestamp_ms,
+            "content": mojibake(" ".join(rng.choice(WORDS) for _ in range(rng.randint(1, 15)))),
+        }
+        if rng.random() < 0.2:
+            message["reactions"] = [{"reaction": mojibake(rng.choice(REACTIONS)), "actor": mojibake(rng.choice(NAMES))}]
+        messages.append(message)
+    path = folder / "message_1.json"
+    path.write_text(json.dumps({
+        "participants": [{"name": mojibake(name)} for name in NAMES],
+        "messages": messages,
+        "title": mojibake("Ekipa Łódź"),
+    }, indent=2), encoding='utf-8')
+    return path
+
+
+def check_chunk_boundaries() -> None:
+    """Stream a small export at chunk sizes 1-16 and compare it with json.loads."""
+    text = json.dumps({
+        "messages": [{"sender_name": "Jan", "timestamp_ms": 1_700_000_000_000, "content": "hej"}],
+        "offset": -1.5e3,
+        "ratio": 1e-7,
+        "count": 12345,
+        "is_still_participant": True,
+        "title": "Ekipa",
+    })
+    expected = json.loads(text)
+    for chunk_size in range(1, 17):
+        stream = _JsonStream(io.StringIO(text), chunk_size=chunk_size)
+        decoded = {key: list(stream.items()) if key == "messages" else stream.value() for key in stream.keys()}
+        assert decoded == expected, f"chunk size {chunk_size}: {decoded}"
+    print("chunk boundaries  ok (chunk sizes 1-16)")
+
+
+def kept_fields(messages: list[dict]) -> list[tuple]:
+    return [(m["sender_name"], m["content"], m.get("reactions", [])) for m in messages]
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 300_000
+    check_chunk_boundaries()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = write_export(Path(tmp), count)
+        text = path.read_text(encoding='utf-8')
+        print(f"{count:,} messages, {len(text) / 2**20:.1f} MiB")
+
+        start = time.perf_counter()
+        raw_repaired = kept_fields(json.loads(RAW_RUN.sub(repair_raw_run, text))["messages"])
+        raw_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        decoded = [
+            (decode_facebook_encoding(sender), decode_facebook_encoding(content), decode_facebook_value(reactions))
+            for sender, content, reactions in kept_fields(json.loads(text)["messages"])
+        ]
+        decoded_time = time.perf_counter() - start
+
+        assert decoded == raw_repaired, "the two repairs disagree"
+        print(f"raw-text repair     {raw_time:7.3f} s")
+        print(f"decode, then repair {decoded_time:7.3f} s  ({raw_time / decoded_time:.1f}x faster)")
+
+        start = time.perf_counter()
+        load_conversation(path)
+        print(f"load_conversation   {time.perf_counter() - start:7.3f} s")
+
+
+if __name__ == "__main__":
+    main()
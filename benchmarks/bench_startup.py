@@ -0,0 +1,77 @@
+"""Benchmark CLI startup against a time budget.
+
+Times `groupchat-wrapped --help` in fresh interpreters, reports the overhead
+over a bare interpreter start and checks that the modules only needed to
+analyze and render a chat are not imported to show help. Exits non-zero when
+the budget is exceeded or a heavy module is loaded.
+
+    python benchmarks/bench_startup.py [runs] [budget_ms]
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Median wall time of `--help`, interpreter start included
+DEFAULT_BUDGET_MS = 150
+
+# Modules that must stay out of the --help / chat listing path
+HEAVY_MODULES = (
+    "groupchat_wrapped.analyzer",
+    "groupchat_wrapped.generator",
+    "groupchat_wrapped.archive",
+    "groupchat_wrapped.server",
+    "zipfile",
+    "concurrent.futures",
+    "multiprocessing",
+)
+
+
+def time_command(args: list[str], runs: int) -> float:
+    """Median wall time of a command in milliseconds."""
+    env = {**os.environ, "PYTHONPATH": str(ROOT)}
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(args, env=env, stdout=subprocess.DEVNULL, check=True)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def loaded_heavy_modules() -> list[str]:
+    """Heavy modules imported by `--help`."""
+    probe = (
+        "import contextlib, io, sys\n"
+        "from groupchat_wrapped.cli import main\n"
+        "with contextlib.redirect_stdout(io.StringIO()), contextlib.suppress(SystemExit):\n"
+        "    main(['--help'])\n"
+        f"print('\\n'.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))\n"
+    )
+    env = {**os.environ, "PYTHONPATH": str(ROOT)}
+    result = subprocess.run([sys.executable, "-c", probe], env=env, capture_output=True, text=True, check=True)
+    return result.stdout.split()
+
+
+def main() -> None:
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    budget = float(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_BUDGET_MS
+
+    bare = time_command([sys.executable, "-c", "pass"], runs)
+    help_ms = time_command([sys.executable, "-m", "groupchat_wrapped.cli", "--help"], runs)
+    heavy = loaded_heavy_modules()
+
+    print(f"interpreter     {bare:7.1f} ms")
+    print(f"--help          {help_ms:7.1f} ms  (+{help_ms - bare:.1f} ms, budget {budget:.0f} ms)")
+    print(f"heavy modules   {', '.join(heavy) or 'none'}")
+
+    if help_ms > budget or heavy:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
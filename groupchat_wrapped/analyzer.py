@@ -1,13 +1,21 @@
 """Statistics analyzer for Group Chat Wrapped."""
 
+from abc import ABC, abstractmethod
+from bisect import bisect_right
 from collections import Counter, defaultdict
-from datetime import datetime, timedelta
-from dataclasses import dataclass, field
-from typing import Any
+from datetime import date, datetime
+from dataclasses import asdict, dataclass, field
+from itertools import compress, islice, pairwise, repeat
+from operator import ne
+from typing import Any, Callable, Iterable, Sequence
 from urllib.parse import urlparse
+import json
+import os
 import re
+import time
 
-from .parser import Conversation, Message
+from .parser import Conversation, ConversationFrame, MESSAGE_TYPES
+from .profiling import Profiler
 
 
 # Polish stopwords (conjunctions, prepositions, etc.)
@@ -56,6 +64,25 @@ ENGLISH_STOPWORDS = {
 
 STOPWORDS = POLISH_STOPWORDS | ENGLISH_STOPWORDS
 
+# Nicknames that count as mentions of a participant, by full name, e.g.
+# {"Kamil Gwóźdź": ["gwozdziu", "kamilek"]}. Matched like first names.
+MENTION_ALIASES: dict[str, list[str]] = {}
+
+MS_PER_HOUR = 3_600_000
+MS_PER_DAY = 86_400_000
+
+# Upper bounds (in days) of the buckets of AnalysisResult.absence_gaps; the
+# last bucket holds the gaps of a year or more
+ABSENCE_BUCKET_DAYS = (1, 7, 30, 90, 365)
+_ABSENCE_BUCKET_MS = tuple(days * MS_PER_DAY for days in ABSENCE_BUCKET_DAYS)
+
+# date.toordinal() of day 0 of the Unix epoch
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+# Fewest messages per shard of a parallel analysis; below that, handing the
+# conversation to worker processes costs more than the scan it saves
+SHARD_MIN_MESSAGES = 250_000
+
 
 @dataclass
 class CategoryResult:
@@ -79,6 +106,53 @@ class AnalysisResult:
     total_participants: int
     date_range: tuple[datetime, datetime]
     categories: list[CategoryResult] = field(default_factory=list)
+    # Per participant: how many gaps between their consecutive messages fall
+    # in each bucket of ABSENCE_BUCKET_DAYS
+    absence_gaps: dict[str, list[int]] = field(default_factory=dict)
+
+
+def result_to_json(result: AnalysisResult) -> str:
+    """Serialize an analysis result to JSON; datetimes become ISO 8601 strings."""
+    def default(value: Any) -> Any:
+        if isinstance(value, (datetime, date)):
+            return value.isoformat()
+        raise TypeError(f"{type(value).__name__} is not JSON serializable")
+    
+    return json.dumps(asdict(result), default=default, ensure_ascii=False, indent=2)
+
+
+def _utc_offset_ms(timestamp_ms: int) -> int:
+    """Local UTC offset at an instant, in milliseconds."""
+    return time.localtime(timestamp_ms // 1000).tm_gmtoff * 1000
+
+
+def local_offsets(start_ms: int, end_ms: int) -> tuple[list[int], list[int]]:
+    """Local UTC offsets between two instants, as (change_at_ms, offset_ms) lists.
+    
+    The offset in effect at ``t`` is ``offsets[bisect_right(change_at, t) - 1]``.
+    Offsets are sampled once a day and every change (DST) is bisected to the
+    second, so messages can be bucketed into local hours and days with integer
+    arithmetic instead of a datetime per message.
+    """
+    change_at = [start_ms]
+    offsets = [_utc_offset_ms(start_ms)]
+    sample = start_ms
+    while sample < end_ms:
+        next_sample = min(sample + MS_PER_DAY, end_ms)
+        offset = _utc_offset_ms(next_sample)
+        if offset != offsets[-1]:
+            # Offset of low second is the old one, of high second the new one
+            low, high = sample // 1000, next_sample // 1000
+            while high - low > 1:
+                middle = (low + high) // 2
+                if _utc_offset_ms(middle * 1000) == offsets[-1]:
+                    low = middle
+                else:
+                    high = middle
+            change_at.append(high * 1000)
+            offsets.append(offset)
+        sample = next_sample
+    return change_at, offsets
 
 
 def is_night_hour(hour: int) -> bool:
@@ -163,62 +237,393 @@ def get_nouns(text: str) -> list[str]:
     return [w for w in words if is_polish_noun(w)]
 
 
-def calculate_streak(messages: list[Message], sender: str) -> int:
-    """Calculate the longest streak of consecutive messages by sender."""
-    max_streak = 0
-    current_streak = 0
+def longest_streaks(sender_ids: Sequence[int], people: int) -> tuple[list[int], list[int]]:
+    """Longest run of consecutive messages of every participant, in one pass.
     
-    for msg in messages:
-        if msg.sender == sender:
-            current_streak += 1
-            max_streak = max(max_streak, current_streak)
-        else:
-            current_streak = 0
+    Returns two lists indexed by participant id: the length of each one's
+    record run and the index of the run's first message (-1 if none).
+    """
+    lengths = [0] * people
+    starts = [-1] * people
+    if not sender_ids:
+        return lengths, starts
+    # Run boundaries: the first message, every change of sender, and the end
+    boundaries = [0, *compress(range(1, len(sender_ids)), map(ne, islice(sender_ids, 1, None), sender_ids)), len(sender_ids)]
+    for start, end in pairwise(boundaries):
+        sender = sender_ids[start]
+        if end - start > lengths[sender]:
+            lengths[sender] = end - start
+            starts[sender] = start
+    return lengths, starts
+
+
+def is_conversation_starter(messages: ConversationFrame, idx: int, gap_hours: int = 4) -> bool:
+    """Check if message at idx starts a new conversation (after gap)."""
+    if idx == 0:
+        return True
     
-    return max_streak
+    time_diff = messages.timestamp_ms[idx] - messages.timestamp_ms[idx-1]
+    return time_diff > gap_hours * 3_600_000
 
 
-def find_longest_absence(messages: list[Message], sender: str) -> tuple[int, datetime | None]:
-    """Find the longest period of inactivity for a sender (in days)."""
-    sender_messages = [m for m in messages if m.sender == sender]
+def is_conversation_ender(messages: ConversationFrame, idx: int, gap_hours: int = 4) -> bool:
+    """Check if message at idx ends a conversation (before gap)."""
+    if idx == len(messages) - 1:
+        return True
     
-    if len(sender_messages) < 2:
-        return 0, None
+    time_diff = messages.timestamp_ms[idx+1] - messages.timestamp_ms[idx]
+    return time_diff > gap_hours * 3_600_000
+
+
+class MentionIndex:
+    """Finds which participants a message mentions, with one tokenization.
     
-    max_gap = timedelta(0)
-    return_date = None
+    A participant is mentioned by their first name (3+ letters) or a
+    nickname as a whole word, or by "@" followed by their first name, full
+    name or nickname. Names are looked up in a dict of words and a trie of
+    handles walked from each "@", so the cost per message does not grow with
+    the number of participants.
+    """
     
-    for i in range(1, len(sender_messages)):
-        gap = sender_messages[i].timestamp - sender_messages[i-1].timestamp
-        if gap > max_gap:
-            max_gap = gap
-            return_date = sender_messages[i].timestamp
+    def __init__(self, participants: dict[int, str], aliases: dict[str, list[str]] | None = None):
+        self._words: dict[str, set[int]] = defaultdict(set)
+        # Trie of what may follow "@"; node[""] holds the ids whose handle ends there
+        self._handles: dict = {}
+        for person, name in participants.items():
+            full_name = name.lower()
+            first_name = (full_name.split() or [""])[0]
+            nicknames = [alias.lower() for alias in (aliases or {}).get(name, ())]
+            if len(first_name) >= 3:
+                self._words[first_name].add(person)
+            for nickname in nicknames:
+                self._words[nickname].add(person)
+            for handle in (first_name, full_name, *nicknames):
+                node = self._handles
+                for char in handle:
+                    node = node.setdefault(char, {})
+                node.setdefault("", set()).add(person)
     
-    return max_gap.days, return_date
+    def mentioned(self, content_lower: str) -> set[int]:
+        """Ids of the participants mentioned in lowercased message text."""
+        found: set[int] = set()
+        for word in content_lower.split():
+            people = self._words.get(word)
+            if people:
+                found |= people
+        at = content_lower.find("@")
+        while at >= 0:
+            node = self._handles
+            found |= node.get("", set())
+            for i in range(at + 1, len(content_lower)):
+                node = node.get(content_lower[i])
+                if node is None:
+                    break
+                found |= node.get("", set())
+            at = content_lower.find("@", at + 1)
+        return found
 
 
-def is_conversation_starter(messages: list[Message], idx: int, gap_hours: int = 4) -> bool:
-    """Check if message at idx starts a new conversation (after gap)."""
-    if idx == 0:
-        return True
+def _ranked(counts: list[int], limit: int | None = None) -> list[tuple[int, int]]:
+    """(participant id, count) pairs with a non-zero count, highest first."""
+    ranked = sorted(
+        ((person, count) for person, count in enumerate(counts) if count),
+        key=lambda item: item[1],
+        reverse=True
+    )
+    return ranked[:limit]
+
+
+POLISH_MONTHS = ['', 'stycznia', 'lutego', 'marca', 'kwietnia', 'maja', 'czerwca',
+                 'lipca', 'sierpnia', 'września', 'października', 'listopada', 'grudnia']
+POLISH_MONTHS_SHORT = ['', 'sty', 'lut', 'mar', 'kwi', 'maj', 'cze',
+                       'lip', 'sie', 'wrz', 'paź', 'lis', 'gru']
+
+_TEXT_CODE = MESSAGE_TYPES.index("text")
+_PHOTO_CODE = MESSAGE_TYPES.index("photo")
+_STICKER_CODE = MESSAGE_TYPES.index("sticker")
+_GIF_CODE = MESSAGE_TYPES.index("gif")
+_NAME_CHANGE_CODE = MESSAGE_TYPES.index("name_change")
+_PHOTO_CHANGE_CODE = MESSAGE_TYPES.index("photo_change")
+
+_EMOJI_PATTERN = re.compile(
+    "["
+    "\U0001F600-\U0001F64F"  # emoticons
+    "\U0001F300-\U0001F5FF"  # symbols & pictographs
+    "\U0001F680-\U0001F6FF"  # transport & map symbols
+    "\U0001F1E0-\U0001F1FF"  # flags
+    "\U00002702-\U000027B0"  # dingbats
+    "\U000024C2-\U0001F251"
+    "]+"
+)
+_URL_PATTERN = re.compile(r'https?://[^\s<>"]+')
+# Matches xD variants like: xd, xD, XD, xdd, XDDD, xDdDdD, xxdd, XXDDD, etc.
+_XD_PATTERN = re.compile(r'[xX]+[dD]+')
+
+
+def _polish_date(moment: date) -> str:
+    return f"{moment.day} {POLISH_MONTHS[moment.month]} {moment.year}"
+
+
+def _add_counts(counts: list[int], other: list[int]) -> list[int]:
+    return [count + other_count for count, other_count in zip(counts, other)]
+
+
+def _merge_nested(counters: dict[Any, Counter], other: dict[Any, Counter]) -> None:
+    for key, counter in other.items():
+        counters[key].update(counter)
+
+
+@dataclass
+class AnalysisContext:
+    """What accumulators read besides their own state: the messages and who sent them."""
+    conversation: Conversation
+    participant_ids: list[int]
+    # Local time is UTC plus the offset in effect at each message (see local_offsets)
+    offset_change_at: list[int]
+    offsets: list[int]
+    
+    @classmethod
+    def from_conversation(cls, conversation: Conversation) -> "AnalysisContext":
+        timestamps = conversation.messages.timestamp_ms
+        return cls(conversation, sorted(set(conversation.messages.sender_id)),
+                   *local_offsets(min(timestamps), max(timestamps)))
     
-    time_diff = messages[idx].timestamp - messages[idx-1].timestamp
-    return time_diff > timedelta(hours=gap_hours)
+    @property
+    def messages(self) -> ConversationFrame:
+        return self.conversation.messages
+    
+    @property
+    def names(self) -> list[str]:
+        return self.conversation.messages.names
 
 
-def is_conversation_ender(messages: list[Message], idx: int, gap_hours: int = 4) -> bool:
-    """Check if message at idx ends a conversation (before gap)."""
-    if idx == len(messages) - 1:
-        return True
+class Accumulator(ABC):
+    """State behind one or more categories, filled by the shared message loop.
+    
+    An accumulator sees one contiguous range of messages, in order, through
+    the hooks it overrides; ``scan_messages`` skips the others:
+    
+    - ``update`` for every message, with its type code and its local time
+      in milliseconds,
+    - ``update_text`` for every non-empty text message,
+    - ``update_range`` once for the whole range, for stats that are cheaper
+      to compute column by column.
     
-    time_diff = messages[idx+1].timestamp - messages[idx].timestamp
-    return time_diff > timedelta(hours=gap_hours)
+    Hooks may read any message of the frame, not only those in their range.
+    ``merge`` folds in an accumulator that saw the range right after this
+    one, as if a single accumulator had seen both; ``finalize`` turns the
+    state into results for ``categories``.
+    
+    Accumulators are pickled without their context, so partial states can
+    come back from worker processes; the receiver attaches its own.
+    """
+    
+    categories: tuple[str, ...] = ()
+    
+    def __init__(self, context: AnalysisContext):
+        self.context = context
+    
+    def update(self, idx: int, sender: int, type_code: int, timestamp_ms: int, local_ms: int) -> None:
+        pass
+    
+    def update_text(self, idx: int, sender: int, content: str) -> None:
+        pass
+    
+    def update_range(self, start: int, stop: int) -> None:
+        pass
+    
+    @abstractmethod
+    def merge(self, other: "Accumulator") -> None:
+        """Fold in the state of an accumulator that saw the following messages."""
+    
+    def __getstate__(self) -> dict[str, Any]:
+        state = self.__dict__.copy()
+        del state["context"]
+        return state
+    
+    @abstractmethod
+    def finalize(self, result: AnalysisResult) -> list[CategoryResult]:
+        """Category results from the state, once every message has been seen."""
+
+
+# Registered accumulators, and the accumulator behind each category id
+ACCUMULATORS: list[type[Accumulator]] = []
+CATEGORY_ACCUMULATORS: dict[str, type[Accumulator]] = {}
+
+# Slide order of the built-in categories; others are added before the summary
+SLIDE_ORDER = (
+    "night_owl", "busiest_day", "prodigal_son", "spam_king", "typing_machine", "poet",
+    "dictionary", "ghost", "starter", "closer", "reactor", "celebrity", "viral_message",
+    "paparazzo", "comedian", "detective", "link_maniac", "emoji_king", "writer",
+    "xd_master", "peak_hour", "group_identity", "mentions_graph", "reactions_graph", "summary",
+)
+
+
+def register_accumulator(cls: type[Accumulator]) -> type[Accumulator]:
+    """Class decorator adding an accumulator and its categories to the registry."""
+    for category_id in cls.categories:
+        if category_id in CATEGORY_ACCUMULATORS:
+            raise ValueError(f"Category {category_id!r} is already registered")
+        CATEGORY_ACCUMULATORS[category_id] = cls
+    ACCUMULATORS.append(cls)
+    return cls
+
+
+def category_ids() -> list[str]:
+    """Every registered category id, in slide order."""
+    builtin = [category_id for category_id in SLIDE_ORDER if category_id in CATEGORY_ACCUMULATORS]
+    added = [category_id for category_id in CATEGORY_ACCUMULATORS if category_id not in SLIDE_ORDER]
+    if "summary" in builtin:
+        builtin.remove("summary")
+        added.append("summary")
+    return builtin + added
+
+
+def select_accumulators(categories: Iterable[str] | None = None) -> tuple[list[type[Accumulator]], list[str]]:
+    """The accumulators needed for some category ids (all by default), and the ids in slide order."""
+    selected = category_ids() if categories is None else list(categories)
+    unknown = [category_id for category_id in selected if category_id not in CATEGORY_ACCUMULATORS]
+    if unknown:
+        raise ValueError(f"Unknown categories: {', '.join(unknown)} (available: {', '.join(category_ids())})")
+    classes = [cls for cls in ACCUMULATORS if any(category_id in selected for category_id in cls.categories)]
+    return classes, [category_id for category_id in category_ids() if category_id in selected]
+
+
+def _timed_hook(hook: Callable[..., None], timings: list[float], slot: int) -> Callable[..., None]:
+    """Wrap an accumulator hook to add its wall time to ``timings[slot]``."""
+    perf_counter = time.perf_counter
+    
+    def timed(*args: Any) -> None:
+        began = perf_counter()
+        hook(*args)
+        timings[slot] += perf_counter() - began
+    
+    return timed
+
+
+def scan_messages(accumulators: list[Accumulator], start: int, stop: int,
+                  timings: list[float] | None = None) -> None:
+    """The shared message loop: feed messages[start:stop] to the accumulators.
+    
+    With ``timings`` (one slot per accumulator), the wall time of every
+    accumulator's hooks is added to its slot; profiling only, as timing each
+    call slows the loop down.
+    """
+    if not accumulators:
+        return
+    context = accumulators[0].context
+    message_hooks = []
+    text_hooks = []
+    for slot, accumulator in enumerate(accumulators):
+        update_range = accumulator.update_range
+        update = accumulator.update
+        update_text = accumulator.update_text
+        if timings is not None:
+            update_range = _timed_hook(update_range, timings, slot)
+            update = _timed_hook(update, timings, slot)
+            update_text = _timed_hook(update_text, timings, slot)
+        if type(accumulator).update_range is not Accumulator.update_range:
+            update_range(start, stop)
+        if type(accumulator).update is not Accumulator.update:
+            message_hooks.append(update)
+        if type(accumulator).update_text is not Accumulator.update_text:
+            text_hooks.append(update_text)
+    if not message_hooks and not text_hooks:
+        return
+    
+    # Columns of the message frame
+    messages = context.messages
+    timestamps = messages.timestamp_ms
+    sender_ids = messages.sender_id
+    type_codes = messages.type_code
+    contents = messages.content
+    offset_change_at = context.offset_change_at
+    offsets = context.offsets
+    
+    for idx in range(start, stop):
+        sender = sender_ids[idx]
+        type_code = type_codes[idx]
+        if message_hooks:
+            timestamp_ms = timestamps[idx]
+            local_ms = timestamp_ms + offsets[bisect_right(offset_change_at, timestamp_ms) - 1]
+            for hook in message_hooks:
+                hook(idx, sender, type_code, timestamp_ms, local_ms)
+        if text_hooks and type_code == _TEXT_CODE:
+            content = contents[idx]
+            if content:
+                for hook in text_hooks:
+                    hook(idx, sender, content)
+
+
+# Context of the conversation a shard worker process analyzes
+_shard_context: AnalysisContext | None = None
+
+
+def _init_shard_worker(conversation: Conversation) -> None:
+    global _shard_context
+    _shard_context = AnalysisContext.from_conversation(conversation)
+
+
+def _scan_shard(categories: list[str], start: int, stop: int,
+                timed: bool) -> tuple[list[Accumulator], list[float] | None]:
+    """Run the accumulators of some categories over messages[start:stop] (pool worker)."""
+    classes, _ = select_accumulators(categories)
+    accumulators = [cls(_shard_context) for cls in classes]
+    timings = [0.0] * len(accumulators) if timed else None
+    scan_messages(accumulators, start, stop, timings)
+    return accumulators, timings
+
+
+def scan_sharded(context: AnalysisContext, categories: list[str], shards: int,
+                 lap: Callable[..., None] = lambda name, scan=None: None,
+                 timings: list[float] | None = None, stop: int | None = None) -> list[Accumulator]:
+    """Scan messages[:stop] (all by default) as ``shards`` contiguous ranges in a process pool.
+    
+    Every worker gets the conversation once, scans its range with fresh
+    accumulators and sends back their partial states, which are merged in
+    message order - so the result is the same as a single scan. ``timings``
+    gets the hook times of every worker, summed.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+    
+    total = len(context.messages) if stop is None else stop
+    starts = [total * shard // shards for shard in range(shards)]
+    stops = starts[1:] + [total]
+    with ProcessPoolExecutor(max_workers=shards, initializer=_init_shard_worker,
+                             initargs=(context.conversation,)) as pool:
+        results = list(pool.map(_scan_shard, repeat(categories), starts, stops, repeat(timings is not None)))
+    
+    lap("merge")
+    parts = [part for part, _ in results]
+    if timings is not None:
+        for _, part_timings in results:
+            for slot, seconds in enumerate(part_timings):
+                timings[slot] += seconds
+    accumulators = parts[0]
+    for part in parts:
+        for accumulator in part:
+            accumulator.context = context
+    for part in parts[1:]:
+        for accumulator, other in zip(accumulators, part):
+            accumulator.merge(other)
+    return accumulators
 
 
-def analyze_conversation(conversation: Conversation) -> AnalysisResult:
-    """Analyze a conversation and generate all category results."""
+def analyze_conversation(conversation: Conversation, profiler: Profiler | None = None,
+                         categories: Iterable[str] | None = None, jobs: int = 1) -> AnalysisResult:
+    """Analyze a conversation and generate the category results.
+    
+    Only the accumulators behind ``categories`` (default: all registered
+    categories) run. With ``jobs`` > 1 (0 = every CPU), a long conversation
+    is split into shards of at least ``SHARD_MIN_MESSAGES`` messages that
+    are scanned in a process pool (see ``scan_sharded``). With a
+    ``profiler``, the message scan and every accumulator's finalization are
+    timed as laps of its current stage, and each accumulator's lap also
+    reports the time its hooks took during the scan.
+    """
+    lap = profiler.lap if profiler is not None else lambda name, scan=None: None
+    classes, selected = select_accumulators(categories)
     messages = conversation.messages
-    participants = set(m.sender for m in messages)
     
     if not messages:
         return AnalysisResult(
@@ -229,260 +634,309 @@ def analyze_conversation(conversation: Conversation) -> AnalysisResult:
             categories=[]
         )
     
-    # Initialize counters
-    messages_per_person: Counter[str] = Counter()
-    night_messages_per_person: Counter[str] = Counter()
-    messages_per_day: Counter[str] = Counter()  # date string -> count
-    nouns_counter: Counter[str] = Counter()
-    message_lengths: dict[str, list[int]] = defaultdict(list)
-    reactions_received: Counter[str] = Counter()
-    reactions_given: Counter[str] = Counter()
-    photos_per_person: Counter[str] = Counter()
-    stickers_per_person: Counter[str] = Counter()
-    gifs_per_person: Counter[str] = Counter()
-    links_per_person: Counter[str] = Counter()
-    domains_counter: Counter[str] = Counter()  # Track domains
-    questions_per_person: Counter[str] = Counter()
-    conversation_starters: Counter[str] = Counter()
-    conversation_enders: Counter[str] = Counter()
-    hour_distribution: Counter[int] = Counter()
-    weekday_distribution: Counter[int] = Counter()
-    month_distribution: Counter[str] = Counter()
-    emojis_per_person: Counter[str] = Counter()
-    favorite_emoji_per_person: dict[str, Counter[str]] = defaultdict(Counter)
-    most_reacted_message: tuple[Message, int, list[str]] | None = None  # (message, count, reactions)
-    
-    # Graph tracking: who mentions whom, who reacts to whom
-    mentions_graph: dict[str, Counter[str]] = defaultdict(Counter)  # sender -> {mentioned_person: count}
-    reactions_graph: dict[str, Counter[str]] = defaultdict(Counter)  # reactor -> {message_author: count}
-    reactions_emoji_graph: dict[tuple[str, str], Counter[str]] = defaultdict(Counter)  # (reactor, target) -> {emoji: count}
-    
-    # xD tracking
-    xd_per_person: Counter[str] = Counter()
-    longest_xd: tuple[str, str, str] | None = None  # (xd_text, sender, message_content)
-    total_xd_count: int = 0
-    
-    # Track group name and photo changes
-    name_changes: list[tuple[datetime, str, str]] = []  # (timestamp, who, content)
-    photo_changes: list[tuple[datetime, str, str]] = []  # (timestamp, who, action)
-    
-    emoji_pattern = re.compile(
-        "["
-        "\U0001F600-\U0001F64F"  # emoticons
-        "\U0001F300-\U0001F5FF"  # symbols & pictographs
-        "\U0001F680-\U0001F6FF"  # transport & map symbols
-        "\U0001F1E0-\U0001F1FF"  # flags
-        "\U00002702-\U000027B0"  # dingbats
-        "\U000024C2-\U0001F251"
-        "]+"
+    if jobs <= 0:
+        jobs = os.cpu_count() or 1
+    shards = min(jobs, len(messages) // SHARD_MIN_MESSAGES)
+    
+    context = AnalysisContext.from_conversation(conversation)
+    
+    timings = [0.0] * len(classes) if profiler is not None else None
+    lap("message scan")
+    if shards > 1:
+        accumulators = scan_sharded(context, selected, shards, lap, timings)
+    else:
+        accumulators = [cls(context) for cls in classes]
+        scan_messages(accumulators, 0, len(messages), timings)
+    return finalize_analysis(context, accumulators, selected, lap, timings)
+
+
+def finalize_analysis(context: AnalysisContext, accumulators: list[Accumulator], selected: list[str],
+                      lap: Callable[..., None] = lambda name, scan=None: None,
+                      timings: list[float] | None = None) -> AnalysisResult:
+    """Build the analysis result from accumulators that have seen every message.
+    
+    Every accumulator's finalization is a lap, passed its scan time from
+    ``timings`` when there is one.
+    """
+    messages = context.messages
+    result = AnalysisResult(
+        conversation_title=context.conversation.title,
+        total_messages=len(messages),
+        total_participants=len(context.participant_ids),
+        date_range=(messages.timestamp(0), messages.timestamp(-1)),
     )
+    found = {}
+    for slot, accumulator in enumerate(accumulators):
+        lap(", ".join(accumulator.categories), timings[slot] if timings is not None else None)
+        for category in accumulator.finalize(result):
+            found[category.category_id] = category
+    result.categories = [found[category_id] for category_id in selected if category_id in found]
+    return result
+
+
+class IncrementalAnalyzer:
+    """Re-analyze a conversation that grows at the end, scanning only its new messages.
     
-    # Analyze each message
-    for idx, msg in enumerate(messages):
-        sender = msg.sender
-        messages_per_person[sender] += 1
+    Between calls the accumulators' state over every message but the last is
+    kept: the last message may still get a successor, which decides whether it
+    ends a conversation. When the next conversation has the same people and
+    starts with every message analyzed last time, unchanged, only the messages
+    after them are scanned and merged in (see ``Accumulator.merge``). Anything
+    else, such as a reaction added to an older message, means a full analysis.
+    """
+    
+    def __init__(self, categories: Iterable[str] | None = None, jobs: int = 1):
+        self.classes, self.selected = select_accumulators(categories)
+        self.jobs = jobs
+        self._context: AnalysisContext | None = None
+        # State over messages[:-1] of the last analyzed conversation
+        self._accumulators: list[Accumulator] = []
+    
+    def _extends(self, context: AnalysisContext) -> bool:
+        """Whether ``context`` holds the previously analyzed messages, unchanged, followed by new ones."""
+        previous = self._context
+        if previous is None:
+            return False
+        old, new = previous.messages, context.messages
+        count = len(old)
+        reactions = old.reaction_offsets[count]
+        changes = len(previous.offset_change_at)
+        return (
+            len(new) >= count
+            and new.names == old.names
+            and context.participant_ids == previous.participant_ids
+            and context.offset_change_at[:changes] == previous.offset_change_at
+            and context.offsets[:changes] == previous.offsets
+            and new.timestamp_ms[:count] == old.timestamp_ms
+            and new.sender_id[:count] == old.sender_id
+            and new.type_code[:count] == old.type_code
+            and new.reaction_offsets[:count + 1] == old.reaction_offsets
+            and new.reaction_actor[:reactions] == old.reaction_actor
+            and new.reaction_emoji[:reactions] == old.reaction_emoji
+            and new.content[:count] == old.content
+        )
+    
+    def analyze(self, conversation: Conversation, profiler: Profiler | None = None) -> AnalysisResult:
+        """Analyze a conversation, scanning only what was added since the previous call if possible.
         
-        # Night messages (0-5 AM)
-        if is_night_hour(msg.timestamp.hour):
-            night_messages_per_person[sender] += 1
+        ``profiler`` is used as in ``analyze_conversation``.
+        """
+        import pickle
         
-        # Messages per day
-        day_key = msg.timestamp.strftime("%Y-%m-%d")
-        messages_per_day[day_key] += 1
+        messages = conversation.messages
+        if not messages:
+            self._context, self._accumulators = None, []
+            return analyze_conversation(conversation, profiler, self.selected)
         
-        # Time distributions
-        hour_distribution[msg.timestamp.hour] += 1
-        weekday_distribution[msg.timestamp.weekday()] += 1
-        month_distribution[msg.timestamp.strftime("%Y-%m")] += 1
+        lap = profiler.lap if profiler is not None else lambda name, scan=None: None
+        context = AnalysisContext.from_conversation(conversation)
+        timings = [0.0] * len(self.classes) if profiler is not None else None
+        last = len(messages) - 1
         
-        # Text analysis
-        if msg.message_type == "text" and msg.content:
-            # Nouns for Słownik Grupy
-            nouns = get_nouns(msg.content)
-            nouns_counter.update(nouns)
-            
-            # Message length
-            message_lengths[sender].append(len(msg.content))
-            
-            # Questions
-            if '?' in msg.content:
-                questions_per_person[sender] += 1
-            
-            # Links and domains
-            urls = re.findall(r'https?://[^\s<>"]+', msg.content)
-            if urls:
-                links_per_person[sender] += len(urls)
-                for url in urls:
-                    try:
-                        domain = urlparse(url).netloc.lower()
-                        # Clean www. prefix
-                        if domain.startswith('www.'):
-                            domain = domain[4:]
-                        if domain:
-                            domains_counter[domain] += 1
-                    except:
-                        pass
-            
-            # Emojis
-            emojis = emoji_pattern.findall(msg.content)
-            emojis_per_person[sender] += len(emojis)
-            for emoji in emojis:
-                favorite_emoji_per_person[sender][emoji] += 1
-            
-            # xD analysis - find all xD variants (case insensitive)
-            # Matches patterns like: xd, xD, XD, xdd, XDDD, xDdDdD, xxdd, XXDDD, etc.
-            xd_matches = re.findall(r'[xX]+[dD]+', msg.content)
-            for xd in xd_matches:
-                xd_per_person[sender] += 1
-                total_xd_count += 1
-                # Track the longest xD
-                if longest_xd is None or len(xd) > len(longest_xd[0]):
-                    longest_xd = (xd, sender, msg.content)
-            
-            # Mention detection: check if message contains other participants' names
-            content_lower = msg.content.lower()
-            for participant in participants:
-                if participant == sender:
-                    continue  # Skip self-mentions
-                # Get first name for matching (more common in casual chat)
-                first_name = participant.split()[0].lower() if participant else ""
-                full_name_lower = participant.lower()
-                # Check for @mention or name mention
-                if (f"@{first_name}" in content_lower or 
-                    f"@{full_name_lower}" in content_lower or
-                    (len(first_name) >= 3 and first_name in content_lower.split())):
-                    mentions_graph[sender][participant] += 1
-        
-        # Media types
-        if msg.message_type == "photo":
-            photos_per_person[sender] += 1
-        elif msg.message_type == "sticker":
-            stickers_per_person[sender] += 1
-        elif msg.message_type == "gif":
-            gifs_per_person[sender] += 1
-        elif msg.message_type == "name_change":
-            name_changes.append((msg.timestamp, sender, msg.content))
-        elif msg.message_type == "photo_change":
-            photo_changes.append((msg.timestamp, sender, msg.content))
-        
-        # Reactions
-        msg_reactions = []
-        for reaction in msg.reactions:
-            actor = reaction.get("actor", "")
-            if actor:
-                try:
-                    actor = actor.encode('latin-1').decode('utf-8', errors='ignore')
-                except (UnicodeEncodeError, UnicodeDecodeError):
-                    pass  # Keep original actor name if encoding fails
-                reactions_given[actor] += 1
-                # Track reaction graph: who (actor) reacts to whose (sender) messages
-                # Include self-reactions (shown as loops on the graph)
-                reactions_graph[actor][sender] += 1
-            reactions_received[sender] += 1
-            # Decode reaction emoji
-            reaction_emoji = reaction.get("reaction", "")
-            try:
-                reaction_emoji = reaction_emoji.encode('latin-1').decode('utf-8', errors='ignore')
-            except (UnicodeEncodeError, UnicodeDecodeError):
-                pass
-            msg_reactions.append(reaction_emoji)
-            # Track emoji breakdown for reaction graph
-            if actor and reaction_emoji:
-                reactions_emoji_graph[(actor, sender)][reaction_emoji] += 1
-        
-        # Track most reacted message
-        if len(msg.reactions) > 0:
-            if most_reacted_message is None or len(msg.reactions) > most_reacted_message[1]:
-                most_reacted_message = (msg, len(msg.reactions), msg_reactions)
+        lap("message scan")
+        if self._extends(context):
+            start = len(self._context.messages) - 1
+            for accumulator in self._accumulators:
+                accumulator.context = context
+            if start < last:
+                added = [cls(context) for cls in self.classes]
+                scan_messages(added, start, last, timings)
+                for accumulator, other in zip(self._accumulators, added):
+                    accumulator.merge(other)
+        else:
+            jobs = self.jobs if self.jobs > 0 else os.cpu_count() or 1
+            shards = min(jobs, last // SHARD_MIN_MESSAGES)
+            if shards > 1:
+                self._accumulators = scan_sharded(context, self.selected, shards, lap, timings, stop=last)
+            else:
+                self._accumulators = [cls(context) for cls in self.classes]
+                scan_messages(self._accumulators, 0, last, timings)
+        self._context = context
         
-        # Conversation starters/enders
-        if is_conversation_starter(messages, idx):
-            conversation_starters[sender] += 1
-        if is_conversation_ender(messages, idx):
-            conversation_enders[sender] += 1
-    
-    # Calculate additional stats
-    longest_streaks = {p: calculate_streak(messages, p) for p in participants}
-    longest_absences = {p: find_longest_absence(messages, p) for p in participants}
-    
-    # Average message length per person
-    avg_message_lengths = {
-        p: sum(lengths) / len(lengths) if lengths else 0
-        for p, lengths in message_lengths.items()
-    }
-    
-    # Find longest single message
-    longest_message = max(
-        (m for m in messages if m.message_type == "text"),
-        key=lambda m: len(m.content),
-        default=None
-    )
+        # Finalize copies with the last message merged in; the kept state stops before it
+        accumulators = pickle.loads(pickle.dumps(self._accumulators))
+        tail = [cls(context) for cls in self.classes]
+        scan_messages(tail, last, last + 1, timings)
+        for accumulator, other in zip(accumulators, tail):
+            accumulator.context = context
+            accumulator.merge(other)
+        return finalize_analysis(context, accumulators, self.selected, lap, timings)
+
+
+@register_accumulator
+class NightOwl(Accumulator):
+    """Messages sent at night, per participant."""
     
-    # Build category results
-    categories = []
+    categories = ("night_owl",)
     
-    # 1. Nocny Marek - Night Owl
-    if night_messages_per_person:
-        top_night = night_messages_per_person.most_common(3)
-        total_night = sum(night_messages_per_person.values())
-        night_percent = total_night * 100 // len(messages) if messages else 0
-        categories.append(CategoryResult(
+    def __init__(self, context: AnalysisContext):
+        super().__init__(context)
+        self.night_messages = [0] * len(context.names)
+    
+    def update(self, idx: int, sender: int, type_code: int, timestamp_ms: int, local_ms: int) -> None:
+        if is_night_hour(local_ms // MS_PER_HOUR % 24):
+            self.night_messages[sender] += 1
+    
+    def merge(self, other: "NightOwl") -> None:
+        self.night_messages = _add_counts(self.night_messages, other.night_messages)
+    
+    def finalize(self, result: AnalysisResult) -> list[CategoryResult]:
+        # 1. Nocny Marek - Night Owl
+        names = self.context.names
+        top_night = [(names[person], count) for person, count in _ranked(self.night_messages, 3)]
+        if not top_night:
+            return []
+        total_night = sum(self.night_messages)
+        night_percent = total_night * 100 // result.total_messages
+        return [CategoryResult(
             category_id="night_owl",
             title="🦉 Nocny Marek",
             subtitle="Najwięcej wiadomości w nocy (00:00 - 05:00)",
             icon="🌙",
-            winner=top_night[0][0] if top_night else None,
+            winner=top_night[0][0],
             winners=[(name, f"{count} wiadomości") for name, count in top_night],
-            value=top_night[0][1] if top_night else 0,
+            value=top_night[0][1],
             extra_info="Kiedy inni śpią, oni piszą!",
             fun_fact=f"Łącznie wysłano {total_night} nocnych wiadomości ({night_percent}% wszystkich)"
-        ))
+        )]
+
+
+@register_accumulator
+class BusiestDay(Accumulator):
+    """Messages per local day."""
     
-    # 2. Najbardziej intensywny dzień
-    if messages_per_day:
-        busiest_day = messages_per_day.most_common(1)[0]
-        day_date = datetime.strptime(busiest_day[0], "%Y-%m-%d")
-        polish_months = ['', 'stycznia', 'lutego', 'marca', 'kwietnia', 'maja', 'czerwca',
-                         'lipca', 'sierpnia', 'września', 'października', 'listopada', 'grudnia']
-        day_formatted = f"{day_date.day} {polish_months[day_date.month]} {day_date.year}"
-        seconds_per_msg = 86400 // busiest_day[1] if busiest_day[1] > 0 else 0  # 86400 seconds in a day
-        categories.append(CategoryResult(
+    categories = ("busiest_day",)
+    
+    def __init__(self, context: AnalysisContext):
+        super().__init__(context)
+        self.messages_per_day: Counter[int] = Counter()  # local day number (days since epoch) -> count
+    
+    def update(self, idx: int, sender: int, type_code: int, timestamp_ms: int, local_ms: int) -> None:
+        self.messages_per_day[local_ms // MS_PER_DAY] += 1
+    
+    def merge(self, other: "BusiestDay") -> None:
+        self.messages_per_day.update(other.messages_per_day)
+    
+    def finalize(self, result: AnalysisResult) -> list[CategoryResult]:
+        # 2. Najbardziej intensywny dzień
+        day, count = self.messages_per_day.most_common(1)[0]
+        seconds_per_msg = 86400 // count  # 86400 seconds in a day
+        return [CategoryResult(
             category_id="busiest_day",
             title="🔥 Dzień Apokalipsy",
             subtitle="Najbardziej intensywny dzień w historii grupy",
             icon="📅",
-            winner=day_formatted,
-            value=busiest_day[1],
-            extra_info=f"{busiest_day[1]} wiadomości w jeden dzień!",
+            winner=_polish_date(date.fromordinal(_EPOCH_ORDINAL + day)),
+            value=count,
+            extra_info=f"{count} wiadomości w jeden dzień!",
             fun_fact=f"To średnio 1 wiadomość co {seconds_per_msg} sekund!"
-        ))
+        )]
+
+
+@register_accumulator
+class Absences(Accumulator):
+    """Gaps between each participant's consecutive messages.
+    
+    Also fills ``AnalysisResult.absence_gaps``.
+    """
+    
+    categories = ("prodigal_son",)
     
-    # 3. Syn Marnotrawny - Longest absence
-    polish_months = ['', 'stycznia', 'lutego', 'marca', 'kwietnia', 'maja', 'czerwca',
-                     'lipca', 'sierpnia', 'września', 'października', 'listopada', 'grudnia']
+    def __init__(self, context: AnalysisContext):
+        super().__init__(context)
+        people = len(context.names)
+        # Each sender's first and latest message in the range, longest gap so
+        # far and the message that ended it, and the distribution of all gaps
+        self.first_seen = [-1] * people
+        self.last_seen_ms: list[int | None] = [None] * people
+        self.longest_ms = [0] * people
+        self.longest_end = [-1] * people
+        self.gaps = [[0] * (len(ABSENCE_BUCKET_DAYS) + 1) for _ in range(people)]
     
-    if longest_absences:
-        prodigal = max(longest_absences.items(), key=lambda x: x[1][0])
-        return_date = prodigal[1][1]
-        if return_date:
-            return_date_str = f"{return_date.day} {polish_months[return_date.month]} {return_date.year}"
+    def _gap(self, sender: int, gap: int, idx: int) -> None:
+        self.gaps[sender][bisect_right(_ABSENCE_BUCKET_MS, gap)] += 1
+        if gap > self.longest_ms[sender]:
+            self.longest_ms[sender] = gap
+            self.longest_end[sender] = idx
+    
+    def update(self, idx: int, sender: int, type_code: int, timestamp_ms: int, local_ms: int) -> None:
+        previous_ms = self.last_seen_ms[sender]
+        if previous_ms is None:
+            self.first_seen[sender] = idx
         else:
-            return_date_str = "kiedyś"
-        categories.append(CategoryResult(
+            self._gap(sender, timestamp_ms - previous_ms, idx)
+        self.last_seen_ms[sender] = timestamp_ms
+    
+    def merge(self, other: "Absences") -> None:
+        timestamps = self.context.messages.timestamp_ms
+        for person, first_idx in enumerate(other.first_seen):
+            if first_idx < 0:
+                continue
+            # The gap across the boundary comes before any of the other range's gaps
+            if self.last_seen_ms[person] is None:
+                self.first_seen[person] = first_idx
+            else:
+                self._gap(person, timestamps[first_idx] - self.last_seen_ms[person], first_idx)
+            if other.longest_ms[person] > self.longest_ms[person]:
+                self.longest_ms[person] = other.longest_ms[person]
+                self.longest_end[person] = other.longest_end[person]
+            self.gaps[person] = _add_counts(self.gaps[person], other.gaps[person])
+            self.last_seen_ms[person] = other.last_seen_ms[person]
+    
+    def finalize(self, result: AnalysisResult) -> list[CategoryResult]:
+        # 3. Syn Marnotrawny - Longest absence
+        messages = self.context.messages
+        names = self.context.names
+        participant_ids = self.context.participant_ids
+        result.absence_gaps = {names[person]: self.gaps[person] for person in participant_ids}
+        absence_days = [gap // MS_PER_DAY for gap in self.longest_ms]
+        
+        def return_date_str(person: int) -> str:
+            if self.longest_end[person] < 0:
+                return "kiedyś"
+            return _polish_date(messages.timestamp(self.longest_end[person]))
+        
+        prodigal = max(participant_ids, key=absence_days.__getitem__)
+        return [CategoryResult(
             category_id="prodigal_son",
             title="🚪 Syn Marnotrawny",
             subtitle="Powrót po najdłuższej przerwie",
             icon="👋",
-            winner=prodigal[0],
-            value=prodigal[1][0],
-            extra_info=f"Zniknął na {prodigal[1][0]} dni!",
-            fun_fact=f"Wrócił {return_date_str}"
-        ))
+            winner=names[prodigal],
+            winners=[
+                (names[person], f"{days} dni (powrót {return_date_str(person)})")
+                for person, days in _ranked(absence_days, 5)
+            ] or None,
+            value=absence_days[prodigal],
+            extra_info=f"Zniknął na {absence_days[prodigal]} dni!",
+            fun_fact=f"Wrócił {return_date_str(prodigal)}"
+        )]
+
+
+@register_accumulator
+class MessageCounts(Accumulator):
+    """Messages per participant."""
+    
+    categories = ("spam_king", "ghost")
+    
+    def __init__(self, context: AnalysisContext):
+        super().__init__(context)
+        self.messages_per_person = [0] * len(context.names)
     
-    # 4. Król Spamu - Most messages overall
-    if messages_per_person:
-        top_spammers = messages_per_person.most_common(5)
-        total = sum(messages_per_person.values())
+    def update_range(self, start: int, stop: int) -> None:
+        for sender, count in Counter(self.context.messages.sender_id[start:stop]).items():
+            self.messages_per_person[sender] += count
+    
+    def merge(self, other: "MessageCounts") -> None:
+        self.messages_per_person = _add_counts(self.messages_per_person, other.messages_per_person)
+    
+    def finalize(self, result: AnalysisResult) -> list[CategoryResult]:
+        names = self.context.names
+        categories = []
+        
+        # 4. Król Spamu - Most messages overall
+        top_spammers = [(names[person], count) for person, count in _ranked(self.messages_per_person, 5)]
+        total = sum(self.messages_per_person)
         categories.append(CategoryResult(
             category_id="spam_king",
             title="👑 Król Spamu",
@@ -494,24 +948,132 @@ def analyze_conversation(conversation: Conversation) -> AnalysisResult:
             extra_info=f"{top_spammers[0][1]} wiadomości!",
             fun_fact=f"To {top_spammers[0][1] * 100 // total}% wszystkich wiadomości"
         ))
-    
-    # 5. Maszyna do pisania - Longest streak
-    if longest_streaks:
-        streak_winner = max(longest_streaks.items(), key=lambda x: x[1])
+        
+        # 8. Duch - Least active
+        ghosts = [(names[person], count) for person, count in _ranked(self.messages_per_person)]
+        ghosts.reverse()
+        least_active = ghosts[:3]
         categories.append(CategoryResult(
+            category_id="ghost",
+            title="👻 Duch",
+            subtitle="Najmniej aktywny uczestnik",
+            icon="🔇",
+            winner=least_active[0][0],
+            winners=[(name, f"{count} wiadomości") for name, count in least_active],
+            value=least_active[0][1],
+            extra_info="Cisza to też odpowiedź!",
+        ))
+        return categories
+
+
+@register_accumulator
+class Streaks(Accumulator):
+    """Each participant's longest run of consecutive messages."""
+    
+    categories = ("typing_machine",)
+    
+    def __init__(self, context: AnalysisContext):
+        super().__init__(context)
+        people = len(context.names)
+        self.lengths = [0] * people
+        self.starts = [-1] * people
+        self.size = 0
+        # (sender, length) of the range's first run, (sender, length, start) of its last
+        self.first_run: tuple[int, int] | None = None
+        self.last_run: tuple[int, int, int] | None = None
+    
+    def update_range(self, start: int, stop: int) -> None:
+        sender_ids = self.context.messages.sender_id[start:stop]
+        if not sender_ids:
+            return
+        self.lengths, starts = longest_streaks(sender_ids, len(self.lengths))
+        self.starts = [run_start + start if run_start >= 0 else -1 for run_start in starts]
+        self.size = len(sender_ids)
+        first = 1
+        while first < self.size and sender_ids[first] == sender_ids[0]:
+            first += 1
+        last = 1
+        while last < self.size and sender_ids[-1 - last] == sender_ids[-1]:
+            last += 1
+        self.first_run = (sender_ids[0], first)
+        self.last_run = (sender_ids[-1], last, stop - last)
+    
+    def merge(self, other: "Streaks") -> None:
+        if other.first_run is None:
+            return
+        if self.first_run is None:
+            self.__dict__.update(other.__dict__)
+            return
+        
+        # A run crossing the boundary starts in this range; it beats a record
+        # of the other range only by being longer, as it comes first
+        first_run, last_run = self.first_run, other.last_run
+        sender, length, start = self.last_run
+        if sender == other.first_run[0]:
+            length += other.first_run[1]
+            if length > self.lengths[sender]:
+                self.lengths[sender] = length
+                self.starts[sender] = start
+            if self.first_run[1] == self.size:
+                first_run = (sender, length)
+            if other.first_run[1] == other.size:
+                last_run = (sender, length, start)
+        
+        for person, other_length in enumerate(other.lengths):
+            if other_length > self.lengths[person]:
+                self.lengths[person] = other_length
+                self.starts[person] = other.starts[person]
+        self.size += other.size
+        self.first_run, self.last_run = first_run, last_run
+    
+    def finalize(self, result: AnalysisResult) -> list[CategoryResult]:
+        # 5. Maszyna do pisania - Longest streak
+        names = self.context.names
+        streak_winner = max(self.context.participant_ids, key=self.lengths.__getitem__)
+        streak_date = self.context.messages.timestamp(self.starts[streak_winner])
+        return [CategoryResult(
             category_id="typing_machine",
             title="⌨️ Maszyna do Pisania",
             subtitle="Najdłuższy ciąg wiadomości pod rząd",
             icon="🔄",
-            winner=streak_winner[0],
-            value=streak_winner[1],
-            extra_info=f"{streak_winner[1]} wiadomości pod rząd!",
-            fun_fact="Rozmowa z samym sobą level: ekspert"
-        ))
+            winner=names[streak_winner],
+            value=self.lengths[streak_winner],
+            extra_info=f"{self.lengths[streak_winner]} wiadomości pod rząd!",
+            fun_fact=f"Rekord padł {_polish_date(streak_date)} - rozmowa z samym sobą level: ekspert"
+        )]
+
+
+@register_accumulator
+class LongestMessage(Accumulator):
+    """The longest text message."""
     
-    # 6. Poeta - Longest message
-    if longest_message:
-        categories.append(CategoryResult(
+    categories = ("poet",)
+    
+    def __init__(self, context: AnalysisContext):
+        super().__init__(context)
+        self.longest_idx = -1
+        self.longest_length = -1
+    
+    def update_text(self, idx: int, sender: int, content: str) -> None:
+        if len(content) > self.longest_length:
+            self.longest_idx = idx
+            self.longest_length = len(content)
+    
+    def merge(self, other: "LongestMessage") -> None:
+        if other.longest_length > self.longest_length:
+            self.longest_idx = other.longest_idx
+            self.longest_length = other.longest_length
+    
+    def finalize(self, result: AnalysisResult) -> list[CategoryResult]:
+        # 6. Poeta - Longest message
+        if self.longest_idx < 0:
+            # Only empty text messages, which the text hook never sees
+            try:
+                self.longest_idx = self.context.messages.type_code.index(_TEXT_CODE)
+            except ValueError:
+                return []
+        longest_message = self.context.messages[self.longest_idx]
+        return [CategoryResult(
             category_id="poet",
             title="📜 Poeta",
             subtitle="Najdłuższa pojedyncza wiadomość",
@@ -520,12 +1082,31 @@ def analyze_conversation(conversation: Conversation) -> AnalysisResult:
             value=len(longest_message.content),
             extra_info=f"{len(longest_message.content)} znaków!",
             fun_fact=f"Fragment: \"{longest_message.content[:100]}...\""
-        ))
+        )]
+
+
+@register_accumulator
+class Nouns(Accumulator):
+    """Nouns used in text messages."""
     
-    # 7. Słownik - Most used nouns
-    if nouns_counter:
-        top_nouns = nouns_counter.most_common(10)
-        categories.append(CategoryResult(
+    categories = ("dictionary",)
+    
+    def __init__(self, context: AnalysisContext):
+        super().__init__(context)
+        self.nouns: Counter[str] = Counter()
+    
+    def update_text(self, idx: int, sender: int, content: str) -> None:
+        self.nouns.update(get_nouns(content))
+    
+    def merge(self, other: "Nouns") -> None:
+        self.nouns.update(other.nouns)
+    
+    def finalize(self, result: AnalysisResult) -> list[CategoryResult]:
+        # 7. Słownik - Most used nouns
+        if not self.nouns:
+            return []
+        top_nouns = self.nouns.most_common(10)
+        return [CategoryResult(
             category_id="dictionary",
             title="📚 Słownik Grupy",
             subtitle="Najczęściej używane rzeczowniki",
@@ -535,119 +1116,258 @@ def analyze_conversation(conversation: Conversation) -> AnalysisResult:
             value=top_nouns[0][1],
             extra_info=f"\"{top_nouns[0][0]}\" - {top_nouns[0][1]} razy!",
             fun_fact="📊 Algorytm: filtrujemy tylko rzeczowniki (po końcówkach i słowniku)"
-        ))
+        )]
+
+
+@register_accumulator
+class Conversations(Accumulator):
+    """Who starts and who ends conversations."""
     
-    # 8. Duch - Least active
-    if messages_per_person:
-        ghosts = messages_per_person.most_common()
-        ghosts.reverse()
-        least_active = ghosts[:3]
-        categories.append(CategoryResult(
-            category_id="ghost",
-            title="👻 Duch",
-            subtitle="Najmniej aktywny uczestnik",
-            icon="🔇",
-            winner=least_active[0][0] if least_active else None,
-            winners=[(name, f"{count} wiadomości") for name, count in least_active],
-            value=least_active[0][1] if least_active else 0,
-            extra_info="Cisza to też odpowiedź!",
-        ))
+    categories = ("starter", "closer")
     
-    # 9. Starter - Conversation starter
-    if conversation_starters:
-        top_starters = conversation_starters.most_common(3)
-        categories.append(CategoryResult(
-            category_id="starter",
-            title="🎬 Reżyser",
-            subtitle="Najczęściej zaczyna rozmowy",
-            icon="▶️",
-            winner=top_starters[0][0],
-            winners=[(name, f"{count}x") for name, count in top_starters],
-            value=top_starters[0][1],
-            extra_info="Zawsze ma temat do rozmowy!",
-            fun_fact="📊 Algorytm: pierwsza wiadomość po 4+ godzinach ciszy = nowa rozmowa"
-        ))
+    def __init__(self, context: AnalysisContext):
+        super().__init__(context)
+        people = len(context.names)
+        self.starters = [0] * people
+        self.enders = [0] * people
     
-    # 10. Zamykacz - Conversation ender
-    if conversation_enders:
-        top_enders = conversation_enders.most_common(3)
-        categories.append(CategoryResult(
-            category_id="closer",
-            title="🚪 Zamykacz",
-            subtitle="Najczęściej kończy rozmowy",
-            icon="⏹️",
-            winner=top_enders[0][0],
-            winners=[(name, f"{count}x") for name, count in top_enders],
-            value=top_enders[0][1],
-            extra_info="Ostatnie słowo zawsze należy do niego!",
-            fun_fact="📊 Algorytm: ostatnia wiadomość przed 4+ godzinami ciszy = koniec rozmowy"
-        ))
+    def update(self, idx: int, sender: int, type_code: int, timestamp_ms: int, local_ms: int) -> None:
+        messages = self.context.messages
+        if is_conversation_starter(messages, idx):
+            self.starters[sender] += 1
+        if is_conversation_ender(messages, idx):
+            self.enders[sender] += 1
     
-    # 11. Reakcjonista - Most reactions given
-    if reactions_given:
-        top_reactors = reactions_given.most_common(5)
-        categories.append(CategoryResult(
-            category_id="reactor",
-            title="❤️ Reakcjonista",
-            subtitle="Rozdał najwięcej reakcji",
-            icon="👍",
-            winner=top_reactors[0][0],
-            winners=[(name, f"{count} reakcji") for name, count in top_reactors],
-            value=top_reactors[0][1],
-            extra_info="Serce grupy!",
-        ))
+    def merge(self, other: "Conversations") -> None:
+        self.starters = _add_counts(self.starters, other.starters)
+        self.enders = _add_counts(self.enders, other.enders)
     
-    # 12. Celebryta - Most reactions received
-    if reactions_received:
-        top_celebrities = reactions_received.most_common(5)
-        categories.append(CategoryResult(
-            category_id="celebrity",
-            title="⭐ Celebryta",
-            subtitle="Otrzymał najwięcej reakcji",
-            icon="🌟",
-            winner=top_celebrities[0][0],
-            winners=[(name, f"{count} reakcji") for name, count in top_celebrities],
-            value=top_celebrities[0][1],
-            extra_info="Gwiazda grupy!",
-            fun_fact="📊 Algorytm: suma wszystkich reakcji otrzymanych na wiadomości"
-        ))
+    def finalize(self, result: AnalysisResult) -> list[CategoryResult]:
+        names = self.context.names
+        categories = []
+        
+        # 9. Starter - Conversation starter
+        top_starters = [(names[person], count) for person, count in _ranked(self.starters, 3)]
+        if top_starters:
+            categories.append(CategoryResult(
+                category_id="starter",
+                title="🎬 Reżyser",
+                subtitle="Najczęściej zaczyna rozmowy",
+                icon="▶️",
+                winner=top_starters[0][0],
+                winners=[(name, f"{count}x") for name, count in top_starters],
+                value=top_starters[0][1],
+                extra_info="Zawsze ma temat do rozmowy!",
+                fun_fact="📊 Algorytm: pierwsza wiadomość po 4+ godzinach ciszy = nowa rozmowa"
+            ))
+        
+        # 10. Zamykacz - Conversation ender
+        top_enders = [(names[person], count) for person, count in _ranked(self.enders, 3)]
+        if top_enders:
+            categories.append(CategoryResult(
+                category_id="closer",
+                title="🚪 Zamykacz",
+                subtitle="Najczęściej kończy rozmowy",
+                icon="⏹️",
+                winner=top_enders[0][0],
+                winners=[(name, f"{count}x") for name, count in top_enders],
+                value=top_enders[0][1],
+                extra_info="Ostatnie słowo zawsze należy do niego!",
+                fun_fact="📊 Algorytm: ostatnia wiadomość przed 4+ godzinami ciszy = koniec rozmowy"
+            ))
+        return categories
+
+
+@register_accumulator
+class Reactions(Accumulator):
+    """Reactions given and received, the most reacted message and who reacts to whom."""
     
-    # 12b. Wiadomość z największą ilością reakcji
-    if most_reacted_message:
-        msg, count, reactions = most_reacted_message
-        reactions_str = " ".join(reactions)
-        msg_preview = msg.content[:150] + "..." if len(msg.content) > 150 else msg.content
-        categories.append(CategoryResult(
-            category_id="viral_message",
-            title="💥 Viral",
-            subtitle="Wiadomość z największą ilością reakcji",
-            icon="🙌",
-            winner=msg.sender,
-            value=count,
-            extra_info=f'"{msg_preview}"',
-            fun_fact=f"Reakcje: {reactions_str}",
-        ))
+    categories = ("reactor", "celebrity", "viral_message", "reactions_graph")
     
-    # 13. Galernik - Most photos/images
-    if photos_per_person:
-        top_photographers = photos_per_person.most_common(3)
-        categories.append(CategoryResult(
-            category_id="paparazzo",
-            title="🖼️ Galernik",
-            subtitle="Wysłał najwięcej obrazków",
-            icon="📁",
-            winner=top_photographers[0][0],
-            winners=[(name, f"{count} obrazków") for name, count in top_photographers],
-            value=top_photographers[0][1],
-            extra_info="Memy, zdjęcia, screenshoty - wszystko się liczy!",
-        ))
+    def __init__(self, context: AnalysisContext):
+        super().__init__(context)
+        people = len(context.names)
+        self.given = [0] * people
+        self.received = [0] * people
+        self.most_reacted: tuple[int, int, list[str]] | None = None  # (message index, count, reactions)
+        self.graph: dict[int, Counter[int]] = defaultdict(Counter)  # reactor -> {message_author: count}
+        self.emoji_graph: dict[tuple[int, int], Counter[str]] = defaultdict(Counter)  # (reactor, target) -> {emoji: count}
     
-    # 14. Śmieszek - Most GIFs/Stickers
-    if gifs_per_person or stickers_per_person:
-        fun_content = Counter()
-        fun_content.update(gifs_per_person)
-        fun_content.update(stickers_per_person)
-        top_funny = fun_content.most_common(3)
+    def update(self, idx: int, sender: int, type_code: int, timestamp_ms: int, local_ms: int) -> None:
+        messages = self.context.messages
+        first_reaction, end_reaction = messages.reaction_offsets[idx], messages.reaction_offsets[idx + 1]
+        if first_reaction == end_reaction:
+            return
+        msg_reactions = []
+        for reaction_idx in range(first_reaction, end_reaction):
+            actor = messages.reaction_actor[reaction_idx]
+            if actor >= 0:
+                self.given[actor] += 1
+                # Track reaction graph: who (actor) reacts to whose (sender) messages
+                # Include self-reactions (shown as loops on the graph)
+                self.graph[actor][sender] += 1
+            self.received[sender] += 1
+            reaction_emoji = messages.reaction_emoji[reaction_idx]
+            msg_reactions.append(reaction_emoji)
+            # Track emoji breakdown for reaction graph
+            if actor >= 0 and reaction_emoji:
+                self.emoji_graph[(actor, sender)][reaction_emoji] += 1
+        
+        # Track most reacted message
+        reaction_count = end_reaction - first_reaction
+        if self.most_reacted is None or reaction_count > self.most_reacted[1]:
+            self.most_reacted = (idx, reaction_count, msg_reactions)
+    
+    def merge(self, other: "Reactions") -> None:
+        self.given = _add_counts(self.given, other.given)
+        self.received = _add_counts(self.received, other.received)
+        if other.most_reacted and (self.most_reacted is None or other.most_reacted[1] > self.most_reacted[1]):
+            self.most_reacted = other.most_reacted
+        _merge_nested(self.graph, other.graph)
+        _merge_nested(self.emoji_graph, other.emoji_graph)
+    
+    def finalize(self, result: AnalysisResult) -> list[CategoryResult]:
+        names = self.context.names
+        categories = []
+        
+        # 11. Reakcjonista - Most reactions given
+        top_reactors = [(names[person], count) for person, count in _ranked(self.given, 5)]
+        if top_reactors:
+            categories.append(CategoryResult(
+                category_id="reactor",
+                title="❤️ Reakcjonista",
+                subtitle="Rozdał najwięcej reakcji",
+                icon="👍",
+                winner=top_reactors[0][0],
+                winners=[(name, f"{count} reakcji") for name, count in top_reactors],
+                value=top_reactors[0][1],
+                extra_info="Serce grupy!",
+            ))
+        
+        # 12. Celebryta - Most reactions received
+        top_celebrities = [(names[person], count) for person, count in _ranked(self.received, 5)]
+        if top_celebrities:
+            categories.append(CategoryResult(
+                category_id="celebrity",
+                title="⭐ Celebryta",
+                subtitle="Otrzymał najwięcej reakcji",
+                icon="🌟",
+                winner=top_celebrities[0][0],
+                winners=[(name, f"{count} reakcji") for name, count in top_celebrities],
+                value=top_celebrities[0][1],
+                extra_info="Gwiazda grupy!",
+                fun_fact="📊 Algorytm: suma wszystkich reakcji otrzymanych na wiadomości"
+            ))
+        
+        # 12b. Wiadomość z największą ilością reakcji
+        if self.most_reacted:
+            msg_idx, count, reactions = self.most_reacted
+            msg = self.context.messages[msg_idx]
+            reactions_str = " ".join(reactions)
+            msg_preview = msg.content[:150] + "..." if len(msg.content) > 150 else msg.content
+            categories.append(CategoryResult(
+                category_id="viral_message",
+                title="💥 Viral",
+                subtitle="Wiadomość z największą ilością reakcji",
+                icon="🙌",
+                winner=msg.sender,
+                value=count,
+                extra_info=f'"{msg_preview}"',
+                fun_fact=f"Reakcje: {reactions_str}",
+            ))
+        
+        # 22. Graf reakcji - kto komu daje reakcje
+        if self.graph:
+            # Convert to list of edges for the graph
+            reactions_edges = []
+            for reactor, targets in self.graph.items():
+                for target, count in targets.items():
+                    # Get emoji breakdown for this edge
+                    emoji_counts = self.emoji_graph.get((reactor, target), Counter())
+                    emoji_breakdown = emoji_counts.most_common(5)  # Top 5 emojis
+                    reactions_edges.append({
+                        'from': names[reactor],
+                        'to': names[target],
+                        'weight': count,
+                        'emojis': emoji_breakdown  # List of (emoji, count) tuples
+                    })
+            
+            # Sort by weight and take top edges
+            reactions_edges.sort(key=lambda x: x['weight'], reverse=True)
+            total_reactions = sum(e['weight'] for e in reactions_edges)
+            
+            # Find top reaction giver
+            reactions_given_total = {reactor: sum(targets.values()) for reactor, targets in self.graph.items()}
+            top_reactor = max(reactions_given_total.items(), key=lambda x: x[1])
+            
+            # Find top reaction receiver
+            reaction_received_from_graph: Counter[int] = Counter()
+            for reactor, targets in self.graph.items():
+                for target, count in targets.items():
+                    reaction_received_from_graph[target] += count
+            top_receiver = reaction_received_from_graph.most_common(1)[0]
+            
+            categories.append(CategoryResult(
+                category_id="reactions_graph",
+                title="❤️ Sieć Reakcji",
+                subtitle="Kto komu daje reakcje",
+                icon="💕",
+                winner=names[top_reactor[0]],
+                winners=reactions_edges,  # All edges
+                value=total_reactions,
+                extra_info=f"Łącznie {total_reactions} reakcji między osobami",
+                fun_fact=f"Najwięcej reakcji dostaje: {names[top_receiver[0]]} ({top_receiver[1]}x)"
+            ))
+        return categories
+
+
+@register_accumulator
+class Media(Accumulator):
+    """Photos, GIFs and stickers per participant."""
+    
+    categories = ("paparazzo", "comedian")
+    
+    def __init__(self, context: AnalysisContext):
+        super().__init__(context)
+        people = len(context.names)
+        self.photos = [0] * people
+        self.stickers = [0] * people
+        self.gifs = [0] * people
+    
+    def update(self, idx: int, sender: int, type_code: int, timestamp_ms: int, local_ms: int) -> None:
+        if type_code == _PHOTO_CODE:
+            self.photos[sender] += 1
+        elif type_code == _STICKER_CODE:
+            self.stickers[sender] += 1
+        elif type_code == _GIF_CODE:
+            self.gifs[sender] += 1
+    
+    def merge(self, other: "Media") -> None:
+        self.photos = _add_counts(self.photos, other.photos)
+        self.stickers = _add_counts(self.stickers, other.stickers)
+        self.gifs = _add_counts(self.gifs, other.gifs)
+    
+    def finalize(self, result: AnalysisResult) -> list[CategoryResult]:
+        names = self.context.names
+        categories = []
+        
+        # 13. Galernik - Most photos/images
+        top_photographers = [(names[person], count) for person, count in _ranked(self.photos, 3)]
+        if top_photographers:
+            categories.append(CategoryResult(
+                category_id="paparazzo",
+                title="🖼️ Galernik",
+                subtitle="Wysłał najwięcej obrazków",
+                icon="📁",
+                winner=top_photographers[0][0],
+                winners=[(name, f"{count} obrazków") for name, count in top_photographers],
+                value=top_photographers[0][1],
+                extra_info="Memy, zdjęcia, screenshoty - wszystko się liczy!",
+            ))
+        
+        # 14. Śmieszek - Most GIFs/Stickers
+        fun_content = [gifs + stickers for gifs, stickers in zip(self.gifs, self.stickers)]
+        top_funny = [(names[person], count) for person, count in _ranked(fun_content, 3)]
         if top_funny:
             categories.append(CategoryResult(
                 category_id="comedian",
@@ -659,11 +1379,33 @@ def analyze_conversation(conversation: Conversation) -> AnalysisResult:
                 value=top_funny[0][1],
                 extra_info="GIF wart więcej niż 1000 słów!",
             ))
+        return categories
+
+
+@register_accumulator
+class Questions(Accumulator):
+    """Text messages with a question mark, per participant."""
     
-    # 15. Detektyw - Most questions
-    if questions_per_person:
-        top_questioners = questions_per_person.most_common(3)
-        categories.append(CategoryResult(
+    categories = ("detective",)
+    
+    def __init__(self, context: AnalysisContext):
+        super().__init__(context)
+        self.questions = [0] * len(context.names)
+    
+    def update_text(self, idx: int, sender: int, content: str) -> None:
+        if '?' in content:
+            self.questions[sender] += 1
+    
+    def merge(self, other: "Questions") -> None:
+        self.questions = _add_counts(self.questions, other.questions)
+    
+    def finalize(self, result: AnalysisResult) -> list[CategoryResult]:
+        # 15. Detektyw - Most questions
+        names = self.context.names
+        top_questioners = [(names[person], count) for person, count in _ranked(self.questions, 3)]
+        if not top_questioners:
+            return []
+        return [CategoryResult(
             category_id="detective",
             title="🔍 Detektyw",
             subtitle="Zadał najwięcej pytań",
@@ -673,15 +1415,49 @@ def analyze_conversation(conversation: Conversation) -> AnalysisResult:
             value=top_questioners[0][1],
             extra_info="Ciekawość to pierwszy stopień do piekła... wiedzy!",
             fun_fact="📊 Algorytm: zliczamy wiadomości zawierające znak zapytania (?)"
-        ))
+        )]
+
+
+@register_accumulator
+class Links(Accumulator):
+    """Links per participant and the domains they point to."""
+    
+    categories = ("link_maniac",)
     
-    # 16. Linkomaniak - Most links
-    if links_per_person:
-        top_linkers = links_per_person.most_common(3)
+    def __init__(self, context: AnalysisContext):
+        super().__init__(context)
+        self.links = [0] * len(context.names)
+        self.domains: Counter[str] = Counter()
+    
+    def update_text(self, idx: int, sender: int, content: str) -> None:
+        urls = _URL_PATTERN.findall(content)
+        if urls:
+            self.links[sender] += len(urls)
+            for url in urls:
+                try:
+                    domain = urlparse(url).netloc.lower()
+                    # Clean www. prefix
+                    if domain.startswith('www.'):
+                        domain = domain[4:]
+                    if domain:
+                        self.domains[domain] += 1
+                except:
+                    pass
+    
+    def merge(self, other: "Links") -> None:
+        self.links = _add_counts(self.links, other.links)
+        self.domains.update(other.domains)
+    
+    def finalize(self, result: AnalysisResult) -> list[CategoryResult]:
+        # 16. Linkomaniak - Most links
+        names = self.context.names
+        top_linkers = [(names[person], count) for person, count in _ranked(self.links, 3)]
+        if not top_linkers:
+            return []
         # Get top 5 domains
-        top_domains = domains_counter.most_common(5)
+        top_domains = self.domains.most_common(5)
         domains_str = " | ".join([f"{d}({c})" for d, c in top_domains]) if top_domains else None
-        categories.append(CategoryResult(
+        return [CategoryResult(
             category_id="link_maniac",
             title="🔗 Linkomaniak",
             subtitle="Udostępnił najwięcej linków",
@@ -691,33 +1467,95 @@ def analyze_conversation(conversation: Conversation) -> AnalysisResult:
             value=top_linkers[0][1],
             extra_info="Internet w pigułce!",
             fun_fact=f"🌐 Top domeny: {domains_str}" if domains_str else None,
-        ))
+        )]
+
+
+@register_accumulator
+class Emoji(Accumulator):
+    """Emoji per participant and everyone's favorites."""
+    
+    categories = ("emoji_king",)
+    
+    def __init__(self, context: AnalysisContext):
+        super().__init__(context)
+        people = len(context.names)
+        self.text_messages = [0] * people
+        self.emojis = [0] * people
+        self.favorites: dict[int, Counter[str]] = defaultdict(Counter)
+    
+    def update_text(self, idx: int, sender: int, content: str) -> None:
+        self.text_messages[sender] += 1
+        emojis = _EMOJI_PATTERN.findall(content)
+        self.emojis[sender] += len(emojis)
+        for emoji in emojis:
+            self.favorites[sender][emoji] += 1
     
-    # 17. Emoji Królem - Most emojis
-    if emojis_per_person:
-        top_emoji = emojis_per_person.most_common(3)
-        winner_name = top_emoji[0][0]
+    def merge(self, other: "Emoji") -> None:
+        self.text_messages = _add_counts(self.text_messages, other.text_messages)
+        self.emojis = _add_counts(self.emojis, other.emojis)
+        _merge_nested(self.favorites, other.favorites)
+    
+    def finalize(self, result: AnalysisResult) -> list[CategoryResult]:
+        # 17. Emoji Królem - Most emojis
+        if not any(self.text_messages):
+            return []
+        names = self.context.names
+        # Everyone with a text message is ranked, even with no emoji
+        ranked_emoji = sorted(
+            ((person, self.emojis[person]) for person, count in enumerate(self.text_messages) if count),
+            key=lambda item: item[1],
+            reverse=True
+        )[:3]
+        top_emoji = [(names[person], count) for person, count in ranked_emoji]
         # Find favorite emoji for the winner
         favorite_emoji = ""
-        if winner_name in favorite_emoji_per_person:
-            fav = favorite_emoji_per_person[winner_name].most_common(3)
+        if ranked_emoji[0][0] in self.favorites:
+            fav = self.favorites[ranked_emoji[0][0]].most_common(3)
             favorite_emoji = " ".join([f"{e}({c}x)" for e, c in fav])
-        categories.append(CategoryResult(
+        return [CategoryResult(
             category_id="emoji_king",
             title="😎 Emoji Master",
             subtitle="Używa najwięcej emoji",
             icon="🎭",
-            winner=winner_name,
+            winner=top_emoji[0][0],
             winners=[(name, f"{count} emoji") for name, count in top_emoji],
             value=top_emoji[0][1],
             extra_info="Obrazek wart więcej niż słowa!",
             fun_fact=f"Ulubione emoji: {favorite_emoji}" if favorite_emoji else None,
-        ))
+        )]
+
+
+@register_accumulator
+class Writer(Accumulator):
+    """Text messages and their total length, per participant."""
+    
+    categories = ("writer",)
     
-    # 18. Pisarz - Longest average message
-    if avg_message_lengths:
+    def __init__(self, context: AnalysisContext):
+        super().__init__(context)
+        people = len(context.names)
+        self.text_messages = [0] * people
+        self.text_length = [0] * people
+    
+    def update_text(self, idx: int, sender: int, content: str) -> None:
+        self.text_messages[sender] += 1
+        self.text_length[sender] += len(content)
+    
+    def merge(self, other: "Writer") -> None:
+        self.text_messages = _add_counts(self.text_messages, other.text_messages)
+        self.text_length = _add_counts(self.text_length, other.text_length)
+    
+    def finalize(self, result: AnalysisResult) -> list[CategoryResult]:
+        # 18. Pisarz - Longest average message
+        names = self.context.names
+        avg_message_lengths = {
+            names[person]: self.text_length[person] / count
+            for person, count in enumerate(self.text_messages) if count
+        }
+        if not avg_message_lengths:
+            return []
         writers = sorted(avg_message_lengths.items(), key=lambda x: x[1], reverse=True)[:3]
-        categories.append(CategoryResult(
+        return [CategoryResult(
             category_id="writer",
             title="📝 Pisarz",
             subtitle="Najdłuższe średnie wiadomości",
@@ -726,50 +1564,123 @@ def analyze_conversation(conversation: Conversation) -> AnalysisResult:
             winners=[(name, f"śr. {int(length)} znaków") for name, length in writers],
             value=int(writers[0][1]),
             extra_info="Jakość ponad ilość!",
-        ))
+        )]
+
+
+@register_accumulator
+class XD(Accumulator):
+    """xD per participant and the longest one."""
+    
+    categories = ("xd_master",)
+    
+    def __init__(self, context: AnalysisContext):
+        super().__init__(context)
+        self.xd_per_person = [0] * len(context.names)
+        self.longest: tuple[str, int, str] | None = None  # (xd_text, sender, message_content)
+        self.total = 0
     
-    # 18b. xD Master - Longest xD and xD stats
-    if xd_per_person and longest_xd:
-        top_xd = xd_per_person.most_common(5)
-        xd_text, xd_sender, xd_message = longest_xd
+    def update_text(self, idx: int, sender: int, content: str) -> None:
+        for xd in _XD_PATTERN.findall(content):
+            self.xd_per_person[sender] += 1
+            self.total += 1
+            if self.longest is None or len(xd) > len(self.longest[0]):
+                self.longest = (xd, sender, content)
+    
+    def merge(self, other: "XD") -> None:
+        self.xd_per_person = _add_counts(self.xd_per_person, other.xd_per_person)
+        self.total += other.total
+        if other.longest and (self.longest is None or len(other.longest[0]) > len(self.longest[0])):
+            self.longest = other.longest
+    
+    def finalize(self, result: AnalysisResult) -> list[CategoryResult]:
+        # 18b. xD Master - Longest xD and xD stats
+        if not self.longest:
+            return []
+        names = self.context.names
+        top_xd = [(names[person], count) for person, count in _ranked(self.xd_per_person, 5)]
+        xd_text, xd_sender_id, xd_message = self.longest
         # Truncate the message for display
         xd_msg_preview = xd_message[:100] + "..." if len(xd_message) > 100 else xd_message
-        categories.append(CategoryResult(
+        return [CategoryResult(
             category_id="xd_master",
             title="😂 xD Master",
             subtitle="Najdłuższe xD w historii grupy",
             icon="🤣",
-            winner=xd_sender,
+            winner=names[xd_sender_id],
             winners=[(name, f"{count} xD") for name, count in top_xd],
             value=len(xd_text),
             extra_info=f"Rekordowe: {xd_text} ({len(xd_text)} znaków)",
-            fun_fact=f"Łącznie {total_xd_count} xD w grupie! 💀"
-        ))
+            fun_fact=f"Łącznie {self.total} xD w grupie! 💀"
+        )]
+
+
+@register_accumulator
+class PeakHour(Accumulator):
+    """Messages per local hour of the day."""
     
-    # 19. Najbardziej aktywna godzina
-    if hour_distribution:
-        peak_hour = hour_distribution.most_common(1)[0]
-        categories.append(CategoryResult(
+    categories = ("peak_hour",)
+    
+    def __init__(self, context: AnalysisContext):
+        super().__init__(context)
+        self.hours: Counter[int] = Counter()
+    
+    def update(self, idx: int, sender: int, type_code: int, timestamp_ms: int, local_ms: int) -> None:
+        self.hours[local_ms // MS_PER_HOUR % 24] += 1
+    
+    def merge(self, other: "PeakHour") -> None:
+        self.hours.update(other.hours)
+    
+    def finalize(self, result: AnalysisResult) -> list[CategoryResult]:
+        # 19. Najbardziej aktywna godzina
+        hour, count = self.hours.most_common(1)[0]
+        return [CategoryResult(
             category_id="peak_hour",
             title="⏰ Godzina Szczytu",
             subtitle="Najbardziej aktywna pora dnia",
             icon="🕐",
-            winner=f"{peak_hour[0]}:00 - {peak_hour[0]+1}:00",
-            value=peak_hour[1],
-            extra_info=f"{peak_hour[1]} wiadomości o tej porze!",
-        ))
+            winner=f"{hour}:00 - {hour+1}:00",
+            value=count,
+            extra_info=f"{count} wiadomości o tej porze!",
+        )]
+
+
+@register_accumulator
+class GroupIdentity(Accumulator):
+    """Changes of the group's name and photo."""
     
-    # 20. Historia nazw i obrazków grupy
-    if name_changes or photo_changes:
-        # Sort name changes by timestamp and calculate durations
-        name_changes_sorted = sorted(name_changes, key=lambda x: x[0])
+    categories = ("group_identity",)
+    
+    def __init__(self, context: AnalysisContext):
+        super().__init__(context)
+        self.name_changes: list[tuple[int, int, str]] = []  # (timestamp_ms, who, content)
+        self.photo_changes: list[tuple[int, int, str]] = []  # (timestamp_ms, who, action)
+    
+    def update(self, idx: int, sender: int, type_code: int, timestamp_ms: int, local_ms: int) -> None:
+        if type_code == _NAME_CHANGE_CODE:
+            self.name_changes.append((timestamp_ms, sender, self.context.messages.content[idx]))
+        elif type_code == _PHOTO_CHANGE_CODE:
+            self.photo_changes.append((timestamp_ms, sender, self.context.messages.content[idx]))
+    
+    def merge(self, other: "GroupIdentity") -> None:
+        self.name_changes.extend(other.name_changes)
+        self.photo_changes.extend(other.photo_changes)
+    
+    def finalize(self, result: AnalysisResult) -> list[CategoryResult]:
+        # 20. Historia nazw i obrazków grupy
+        if not self.name_changes and not self.photo_changes:
+            return []
+        names = self.context.names
+        first_timestamp, last_timestamp = result.date_range
         
-        polish_months_short = ['', 'sty', 'lut', 'mar', 'kwi', 'maj', 'cze',
-                               'lip', 'sie', 'wrz', 'paź', 'lis', 'gru']
+        # Sort name changes by timestamp and calculate durations
+        name_changes_sorted = [
+            (datetime.fromtimestamp(ts / 1000), who, content)
+            for ts, who, content in sorted(self.name_changes, key=lambda x: x[0])
+        ]
         
         # Calculate timeline for names with durations
         timeline_entries = []
-        total_span = (messages[-1].timestamp - messages[0].timestamp).days if messages else 1
+        total_span = (last_timestamp - first_timestamp).days
         if total_span < 1:
             total_span = 1
         
@@ -787,7 +1698,7 @@ def analyze_conversation(conversation: Conversation) -> AnalysisResult:
             if i + 1 < len(name_changes_sorted):
                 end_ts = name_changes_sorted[i + 1][0]
             else:
-                end_ts = messages[-1].timestamp
+                end_ts = last_timestamp
             
             duration_days = (end_ts - ts).days
             if duration_days < 1:
@@ -798,10 +1709,10 @@ def analyze_conversation(conversation: Conversation) -> AnalysisResult:
             if percentage < 5:
                 percentage = 5  # Minimum width for visibility
             
-            date_str = f"{ts.day} {polish_months_short[ts.month]}"
+            date_str = f"{ts.day} {POLISH_MONTHS_SHORT[ts.month]}"
             timeline_entries.append({
                 'name': new_name,
-                'who': who,
+                'who': names[who],
                 'date': date_str,
                 'days': duration_days,
                 'percentage': percentage,
@@ -809,127 +1720,110 @@ def analyze_conversation(conversation: Conversation) -> AnalysisResult:
             })
         
         # Count photo changes
-        photo_count = len(photo_changes)
+        photo_count = len(self.photo_changes)
         
-        categories.append(CategoryResult(
+        return [CategoryResult(
             category_id="group_identity",
             title="🎭 Metamorfozy",
             subtitle="Historia nazw grupy",
             icon="🎨",
             winner=None,
             winners=timeline_entries,  # Special format for horizontal timeline
-            value=len(name_changes),
-            extra_info=f"{len(name_changes)} zmian nazwy" + (f", {photo_count} zmian zdjęcia" if photo_count else ""),
+            value=len(self.name_changes),
+            extra_info=f"{len(self.name_changes)} zmian nazwy" + (f", {photo_count} zmian zdjęcia" if photo_count else ""),
             fun_fact=f"Najdłuższa nazwa: {max(timeline_entries, key=lambda x: x['days'])['days']} dni" if timeline_entries else None
-        ))
+        )]
+
+
+@register_accumulator
+class Mentions(Accumulator):
+    """Who mentions whom (see ``MentionIndex``)."""
+    
+    categories = ("mentions_graph",)
+    
+    def __init__(self, context: AnalysisContext):
+        super().__init__(context)
+        names = context.names
+        self.index = MentionIndex({person: names[person] for person in context.participant_ids}, MENTION_ALIASES)
+        self.graph: dict[int, Counter[int]] = defaultdict(Counter)  # sender -> {mentioned_person: count}
     
-    # 21. Graf oznaczania - kto kogo oznacza
-    if mentions_graph:
+    def update_text(self, idx: int, sender: int, content: str) -> None:
+        for participant_id in sorted(self.index.mentioned(content.lower())):
+            if participant_id != sender:  # Skip self-mentions
+                self.graph[sender][participant_id] += 1
+    
+    def merge(self, other: "Mentions") -> None:
+        _merge_nested(self.graph, other.graph)
+    
+    def finalize(self, result: AnalysisResult) -> list[CategoryResult]:
+        # 21. Graf oznaczania - kto kogo oznacza
+        if not self.graph:
+            return []
+        names = self.context.names
+        
         # Convert to list of edges for the graph
         mentions_edges = []
-        for sender, targets in mentions_graph.items():
+        for sender, targets in self.graph.items():
             for target, count in targets.items():
                 mentions_edges.append({
-                    'from': sender,
-                    'to': target,
+                    'from': names[sender],
+                    'to': names[target],
                     'weight': count
                 })
         
-        if mentions_edges:
-            # Sort by weight and take top edges
-            mentions_edges.sort(key=lambda x: x['weight'], reverse=True)
-            total_mentions = sum(e['weight'] for e in mentions_edges)
-            
-            # Find who mentions the most people
-            mentions_given_total = {sender: sum(targets.values()) for sender, targets in mentions_graph.items()}
-            top_mentioner = max(mentions_given_total.items(), key=lambda x: x[1]) if mentions_given_total else None
-            
-            # Find who is mentioned the most
-            mentioned_count: Counter[str] = Counter()
-            for sender, targets in mentions_graph.items():
-                for target, count in targets.items():
-                    mentioned_count[target] += count
-            top_mentioned = mentioned_count.most_common(1)[0] if mentioned_count else None
-            
-            categories.append(CategoryResult(
-                category_id="mentions_graph",
-                title="🏷️ Sieć Oznaczeń",
-                subtitle="Kto kogo oznacza w rozmowach",
-                icon="📢",
-                winner=top_mentioner[0] if top_mentioner else None,
-                winners=mentions_edges,  # All edges
-                value=total_mentions,
-                extra_info=f"Łącznie {total_mentions} oznaczeń",
-                fun_fact=f"Najczęściej oznaczany: {top_mentioned[0]} ({top_mentioned[1]}x)" if top_mentioned else None
-            ))
-    
-    # 22. Graf reakcji - kto komu daje reakcje
-    if reactions_graph:
-        # Convert to list of edges for the graph
-        reactions_edges = []
-        for reactor, targets in reactions_graph.items():
+        # Sort by weight and take top edges
+        mentions_edges.sort(key=lambda x: x['weight'], reverse=True)
+        total_mentions = sum(e['weight'] for e in mentions_edges)
+        
+        # Find who mentions the most people
+        mentions_given_total = {sender: sum(targets.values()) for sender, targets in self.graph.items()}
+        top_mentioner = max(mentions_given_total.items(), key=lambda x: x[1])
+        
+        # Find who is mentioned the most
+        mentioned_count: Counter[int] = Counter()
+        for sender, targets in self.graph.items():
             for target, count in targets.items():
-                # Get emoji breakdown for this edge
-                emoji_counts = reactions_emoji_graph.get((reactor, target), Counter())
-                emoji_breakdown = emoji_counts.most_common(5)  # Top 5 emojis
-                reactions_edges.append({
-                    'from': reactor,
-                    'to': target,
-                    'weight': count,
-                    'emojis': emoji_breakdown  # List of (emoji, count) tuples
-                })
+                mentioned_count[target] += count
+        top_mentioned = mentioned_count.most_common(1)[0]
         
-        if reactions_edges:
-            # Sort by weight and take top edges
-            reactions_edges.sort(key=lambda x: x['weight'], reverse=True)
-            total_reactions = sum(e['weight'] for e in reactions_edges)
-            
-            # Find top reaction giver
-            reactions_given_total = {reactor: sum(targets.values()) for reactor, targets in reactions_graph.items()}
-            top_reactor = max(reactions_given_total.items(), key=lambda x: x[1]) if reactions_given_total else None
-            
-            # Find top reaction receiver
-            reaction_received_from_graph: Counter[str] = Counter()
-            for reactor, targets in reactions_graph.items():
-                for target, count in targets.items():
-                    reaction_received_from_graph[target] += count
-            top_receiver = reaction_received_from_graph.most_common(1)[0] if reaction_received_from_graph else None
-            
-            categories.append(CategoryResult(
-                category_id="reactions_graph",
-                title="❤️ Sieć Reakcji",
-                subtitle="Kto komu daje reakcje",
-                icon="💕",
-                winner=top_reactor[0] if top_reactor else None,
-                winners=reactions_edges,  # All edges
-                value=total_reactions,
-                extra_info=f"Łącznie {total_reactions} reakcji między osobami",
-                fun_fact=f"Najwięcej reakcji dostaje: {top_receiver[0]} ({top_receiver[1]}x)" if top_receiver else None
-            ))
+        return [CategoryResult(
+            category_id="mentions_graph",
+            title="🏷️ Sieć Oznaczeń",
+            subtitle="Kto kogo oznacza w rozmowach",
+            icon="📢",
+            winner=names[top_mentioner[0]],
+            winners=mentions_edges,  # All edges
+            value=total_mentions,
+            extra_info=f"Łącznie {total_mentions} oznaczeń",
+            fun_fact=f"Najczęściej oznaczany: {names[top_mentioned[0]]} ({top_mentioned[1]}x)"
+        )]
+
+
+@register_accumulator
+class Summary(Accumulator):
+    """Overall statistics; needs nothing beyond the messages themselves."""
     
-    # 23. Statystyki ogólne
-    total_days = (messages[-1].timestamp - messages[0].timestamp).days + 1
-    avg_per_day = len(messages) / total_days if total_days > 0 else 0
-    
-    categories.append(CategoryResult(
-        category_id="summary",
-        title="📊 Podsumowanie",
-        subtitle=f"Statystyki grupy {conversation.title}",
-        icon="📈",
-        winner=None,
-        extra_info=f"""
-        📨 Łącznie wiadomości: {len(messages):,}
-        👥 Uczestników: {len(participants)}
+    categories = ("summary",)
+    
+    def merge(self, other: "Summary") -> None:
+        pass
+    
+    def finalize(self, result: AnalysisResult) -> list[CategoryResult]:
+        # 23. Statystyki ogólne
+        first_timestamp, last_timestamp = result.date_range
+        total_days = (last_timestamp - first_timestamp).days + 1
+        avg_per_day = result.total_messages / total_days if total_days > 0 else 0
+        return [CategoryResult(
+            category_id="summary",
+            title="📊 Podsumowanie",
+            subtitle=f"Statystyki grupy {result.conversation_title}",
+            icon="📈",
+            winner=None,
+            extra_info=f"""
+        📨 Łącznie wiadomości: {result.total_messages:,}
+        👥 Uczestników: {result.total_participants}
         📅 Dni aktywności: {total_days:,}
         📊 Średnio dziennie: {avg_per_day:.1f}
         """,
-        fun_fact=f"Od {messages[0].timestamp.strftime('%d.%m.%Y')} do {messages[-1].timestamp.strftime('%d.%m.%Y')}"
-    ))
-    
-    return AnalysisResult(
-        conversation_title=conversation.title,
-        total_messages=len(messages),
-        total_participants=len(participants),
-        date_range=(messages[0].timestamp, messages[-1].timestamp),
-        categories=categories
-    )
+            fun_fact=f"Od {first_timestamp.strftime('%d.%m.%Y')} do {last_timestamp.strftime('%d.%m.%Y')}"
+        )]
@@ -0,0 +1,184 @@
+"""Read Facebook exports straight from their ZIP archives.
+
+Facebook delivers an export as one or more ZIP files ("parts") that together
+hold a single directory tree. Only the central directories are read to find
+``inbox/*/message_*.json``; photos, videos and other media are never
+extracted, and message files are decompressed as they are streamed.
+
+``ZipFolder`` and ``ZipMember`` provide the parts of the ``Path`` interface
+that the parser, the cache and chat discovery use, so they can be passed
+anywhere a chat folder or message file path is expected.
+"""
+
+import fnmatch
+import io
+import os
+import re
+import zipfile
+from pathlib import Path, PurePosixPath
+from types import SimpleNamespace
+from typing import IO, Iterator
+
+
+# The only members that are indexed
+_MESSAGE_MEMBER = re.compile(r'(?:^|/)inbox/[^/]+/message_\d+\.json$')
+
+# Archives opened so far in this process, so each central directory is read once
+_open_archives: dict[Path, zipfile.ZipFile] = {}
+
+# A forked worker shares the parent's file offsets, so it must reopen archives
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_open_archives.clear)
+
+
+def _open_archive(path: Path) -> zipfile.ZipFile:
+    archive = _open_archives.get(path)
+    if archive is None:
+        archive = _open_archives[path] = zipfile.ZipFile(path)
+    return archive
+
+
+class ZipMember:
+    """A message file inside a ZIP archive."""
+
+    def __init__(self, archive: Path, member: str, size: int, mtime_ns: int):
+        self.archive = archive
+        self.member = member
+        self._size = size
+        self._mtime_ns = mtime_ns
+
+    @property
+    def name(self) -> str:
+        return PurePosixPath(self.member).name
+
+    def open(self, mode: str = 'r', encoding: str = 'utf-8') -> IO:
+        """Stream the decompressed member, as text unless ``mode`` is binary."""
+        stream = _open_archive(self.archive).open(self.member)
+        return stream if 'b' in mode else io.TextIOWrapper(stream, encoding=encoding)
+
+    def stat(self) -> SimpleNamespace:
+        """Uncompressed size, and the mtime of the archive holding the member."""
+        return SimpleNamespace(st_size=self._size, st_mtime_ns=self._mtime_ns)
+
+    def resolve(self) -> "ZipMember":
+        return ZipMember(self.archive.resolve(), self.member, self._size, self._mtime_ns)
+
+    def is_file(self) -> bool:
+        return True
+
+    def is_dir(self) -> bool:
+        return False
+
+    def __lt__(self, other: "ZipMember") -> bool:
+        return self.member < other.member
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, ZipMember) and (self.archive, self.member) == (other.archive, other.member)
+
+    def __hash__(self) -> int:
+        return hash((self.archive, self.member))
+
+    def __str__(self) -> str:
+        return f"{self.archive}/{self.member}"
+
+    def __repr__(self) -> str:
+        return f"ZipMember({str(self)!r})"
+
+
+class ZipFolder:
+    """A directory in the merged tree of one or more ZIP archives."""
+
+    def __init__(self, archives: list[Path], dirs: dict[str, set[str]],
+                 files: dict[str, list[ZipMember]], prefix: str = ""):
+        self.archives = archives
+        self._dirs = dirs
+        self._files = files
+        self.prefix = prefix
+
+    @property
+    def name(self) -> str:
+        return PurePosixPath(self.prefix).name
+
+    def is_file(self) -> bool:
+        return False
+
+    def is_dir(self) -> bool:
+        return True
+
+    def __getstate__(self) -> dict:
+        # Ship only this folder's subtree to worker processes
+        return {
+            "archives": self.archives,
+            "prefix": self.prefix,
+            "_dirs": {prefix: names for prefix, names in self._dirs.items() if prefix.startswith(self.prefix)},
+            "_files": {prefix: files for prefix, files in self._files.items() if prefix.startswith(self.prefix)},
+        }
+
+    def resolve(self) -> "ZipFolder":
+        return ZipFolder([archive.resolve() for archive in self.archives], self._dirs, self._files, self.prefix)
+
+    def _child(self, name: str) -> "ZipFolder":
+        return ZipFolder(self.archives, self._dirs, self._files, f"{self.prefix}{name}/")
+
+    def iterdir(self) -> Iterator["ZipFolder | ZipMember"]:
+        for name in sorted(self._dirs.get(self.prefix, ())):
+            yield self._child(name)
+        yield from self._files.get(self.prefix, ())
+
+    def glob(self, pattern: str) -> Iterator[ZipMember]:
+        """Files directly in this folder whose name matches the pattern."""
+        for member in self._files.get(self.prefix, ()):
+            if fnmatch.fnmatch(member.name, pattern):
+                yield member
+
+    def find_inbox(self) -> "ZipFolder | None":
+        """Locate the messages inbox below this folder."""
+        for prefix in sorted(self._dirs, key=len):
+            if prefix.startswith(self.prefix) and PurePosixPath(prefix).name == "inbox":
+                return ZipFolder(self.archives, self._dirs, self._files, prefix)
+        return None
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, ZipFolder) and (self.archives, self.prefix) == (other.archives, other.prefix)
+
+    def __hash__(self) -> int:
+        return hash((tuple(self.archives), self.prefix))
+
+    def __str__(self) -> str:
+        archives = self.archives[0] if len(self.archives) == 1 else f"{self.archives[0].parent}/*.zip"
+        return f"{archives}/{self.prefix}".rstrip("/")
+
+
+def zip_archives(path: Path) -> list[Path]:
+    """The ZIP archives of an export: the file itself, or every .zip part in a folder."""
+    if path.is_file():
+        return [path] if zipfile.is_zipfile(path) else []
+    return sorted(part for part in path.glob("*.zip") if zipfile.is_zipfile(part))
+
+
+def open_zip_export(archives: list[Path]) -> ZipFolder:
+    """Index the message files of a (multi-part) ZIP export.
+
+    Returns the root of the tree formed by all parts. Only central
+    directories are read; nothing is decompressed.
+    """
+    dirs: dict[str, set[str]] = {}
+    files: dict[str, list[ZipMember]] = {}
+    seen: set[str] = set()
+    for archive in archives:
+        mtime_ns = archive.stat().st_mtime_ns
+        for info in _open_archive(archive).infolist():
+            if info.filename in seen or not _MESSAGE_MEMBER.search(info.filename):
+                continue
+            seen.add(info.filename)
+            parts = info.filename.split("/")
+            folder = "".join(f"{part}/" for part in parts[:-1])
+            files.setdefault(folder, []).append(ZipMember(archive, info.filename, info.file_size, mtime_ns))
+            # Register every ancestor folder with its parent
+            prefix = ""
+            for part in parts[:-1]:
+                dirs.setdefault(prefix, set()).add(part)
+                prefix += f"{part}/"
+    for members in files.values():
+        members.sort()
+    return ZipFolder(archives, dirs, files)
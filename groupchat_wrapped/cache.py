@@ -0,0 +1,296 @@
+"""Columnar on-disk cache of parsed conversations.
+
+A snapshot stores a conversation as flat, fixed-width columns so a warm start
+can read them straight into arrays and skip JSON decoding entirely:
+
+    preamble   magic, format version, header length
+    header     JSON: sources (path, size, mtime), title, participants,
+               participant table, reaction emoji table, column layout
+    columns    int64 timestamp_ms, int32 sender ids, uint8 type codes,
+               int64 content offsets into one UTF-8 blob, int64 reaction
+               offsets, int32 reaction actor/emoji ids, the UTF-8 blob
+
+The columns are those of ``ConversationFrame``; reaction emoji are interned
+into the header's emoji table. Snapshots are keyed by the
+message file paths and validated against their sizes and mtimes, so any
+change re-parses the JSON. Snapshots past ``CACHE_SIZE_LIMIT`` bytes in total
+are evicted, least recently used first.
+
+The same directory holds one ``InboxIndex`` per inbox: a JSON-lines file with
+the discovery info of every chat folder, fingerprinted the same way, so a
+repeat listing only rescans chats whose files changed.
+"""
+
+import hashlib
+import json
+import os
+import struct
+import sys
+import tempfile
+from array import array
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO, Iterator
+
+from .parser import Conversation, ConversationFrame
+
+
+CACHE_VERSION = 5
+INDEX_VERSION = 1
+
+# Total size of the snapshots kept in a cache directory, in bytes
+CACHE_SIZE_LIMIT = 2 * 2**30
+
+_MAGIC = b"GCWC"
+_PREAMBLE = struct.Struct("<4sII")  # magic, version, header length
+_ALIGNMENT = 8
+
+# Column name -> array typecode, in file order
+_COLUMNS = (
+    ("timestamp_ms", "q"),
+    ("sender_id", "i"),
+    ("type_code", "B"),
+    ("content_offsets", "q"),
+    ("reaction_offsets", "q"),
+    ("reaction_actor", "i"),
+    ("reaction_emoji", "i"),
+    ("content", "B"),
+)
+
+
+def default_cache_dir() -> Path:
+    """Return the per-user cache directory for snapshots."""
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "groupchat-wrapped"
+
+
+def _sources(files: list[Path]) -> list[list]:
+    """Fingerprint message files by resolved path, size and mtime."""
+    sources = []
+    for file_path in files:
+        stat = file_path.stat()
+        sources.append([str(file_path.resolve()), stat.st_size, stat.st_mtime_ns])
+    return sources
+
+
+def _entry_path(files: list[Path], cache_dir: Path) -> Path:
+    """Snapshot location for a set of message files."""
+    key = "\0".join(str(file_path.resolve()) for file_path in files)
+    return cache_dir / f"{hashlib.sha1(key.encode('utf-8')).hexdigest()}.gcw"
+
+
+@contextmanager
+def _temporary_file(path: Path, mode: str) -> Iterator[IO]:
+    """Write a file under a unique temporary name, then move it into place.
+
+    Writers in other processes or threads never share the temporary file, and
+    readers see the old file or the complete new one. On error the temporary
+    file is removed and the error re-raised.
+    """
+    f = tempfile.NamedTemporaryFile(mode, dir=path.parent, prefix=f"{path.name}.", suffix=".tmp", delete=False,
+                                    **({} if 'b' in mode else {"encoding": "utf-8"}))
+    try:
+        with f:
+            yield f
+        os.replace(f.name, path)
+    except BaseException:
+        try:
+            os.remove(f.name)
+        except OSError:
+            pass
+        raise
+
+
+def save_cached_conversation(conversation: Conversation, files: list[Path], cache_dir: Path) -> None:
+    """Write a columnar snapshot of a parsed conversation.
+
+    Failures are ignored - the cache is only an optimization.
+    """
+    frame = conversation.messages
+    emoji_ids: dict[str, int] = {}
+    blob = bytearray()
+    content_offsets = array("q", [0])
+    for content in frame.content:
+        blob += content.encode('utf-8', 'surrogatepass')
+        content_offsets.append(len(blob))
+
+    columns = {
+        "timestamp_ms": frame.timestamp_ms,
+        "sender_id": frame.sender_id,
+        "type_code": frame.type_code,
+        "content_offsets": content_offsets,
+        "reaction_offsets": frame.reaction_offsets,
+        "reaction_actor": frame.reaction_actor,
+        "reaction_emoji": array("i", [emoji_ids.setdefault(emoji, len(emoji_ids)) for emoji in frame.reaction_emoji]),
+        "content": array("B", blob),
+    }
+
+    # Lay the columns out back to back, each aligned for its item size
+    layout = {}
+    offset = 0
+    for name, _ in _COLUMNS:
+        offset = -(-offset // _ALIGNMENT) * _ALIGNMENT
+        layout[name] = [offset, len(columns[name])]
+        offset += len(columns[name]) * columns[name].itemsize
+
+    try:
+        header = json.dumps({
+            "sources": _sources(files),
+            "byteorder": sys.byteorder,
+            "title": conversation.title,
+            "participants": conversation.participants,
+            "names": frame.names,
+            "emoji": list(emoji_ids),
+            "columns": layout,
+        }, ensure_ascii=False).encode('utf-8', 'surrogatepass')
+
+        # Column offsets are relative to the first aligned byte after the header
+        data_start = -(-(_PREAMBLE.size + len(header)) // _ALIGNMENT) * _ALIGNMENT
+
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        entry = _entry_path(files, cache_dir)
+        with _temporary_file(entry, 'wb') as f:
+            f.write(_PREAMBLE.pack(_MAGIC, CACHE_VERSION, len(header)))
+            f.write(header)
+            for name, _ in _COLUMNS:
+                f.seek(data_start + layout[name][0])
+                columns[name].tofile(f)
+    except OSError:
+        pass
+    else:
+        evict_snapshots(cache_dir)
+
+
+def evict_snapshots(cache_dir: Path, limit: int = CACHE_SIZE_LIMIT) -> None:
+    """Delete the least recently used snapshots until the rest fit in ``limit`` bytes.
+
+    A snapshot's mtime is its last use (see ``load_cached_conversation``);
+    the most recent one is always kept.
+    """
+    snapshots = []
+    try:
+        with os.scandir(cache_dir) as entries:
+            for entry in entries:
+                if entry.name.endswith(".gcw"):
+                    stat = entry.stat()
+                    snapshots.append((stat.st_mtime_ns, stat.st_size, entry.path))
+    except OSError:
+        return
+    snapshots.sort()
+    total = sum(size for _, size, _ in snapshots)
+    for _, size, path in snapshots[:-1]:
+        if total <= limit:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        total -= size
+
+
+def load_cached_conversation(files: list[Path], cache_dir: Path) -> Conversation | None:
+    """Load a snapshot for these message files, or None if missing or stale."""
+    entry = _entry_path(files, cache_dir)
+    try:
+        sources = _sources(files)
+        with open(entry, 'rb') as f:
+            magic, version, header_length = _PREAMBLE.unpack(f.read(_PREAMBLE.size))
+            if magic != _MAGIC or version != CACHE_VERSION:
+                return None
+            header = json.loads(f.read(header_length).decode('utf-8', 'surrogatepass'))
+            if header["sources"] != sources or header["byteorder"] != sys.byteorder:
+                return None
+
+            # Read each column straight from the file into a typed array
+            data_start = -(-(_PREAMBLE.size + header_length) // _ALIGNMENT) * _ALIGNMENT
+            column = {}
+            for name, code in _COLUMNS:
+                offset, length = header["columns"][name]
+                f.seek(data_start + offset)
+                column[name] = array(code)
+                column[name].fromfile(f, length)
+
+        blob = memoryview(column["content"])
+        offsets = column["content_offsets"]
+        emoji = header["emoji"]
+
+        frame = ConversationFrame()
+        for name in header["names"]:
+            frame.intern_name(name)
+        frame.timestamp_ms = column["timestamp_ms"]
+        frame.sender_id = column["sender_id"]
+        frame.type_code = column["type_code"]
+        frame.content = [
+            str(blob[offsets[i]:offsets[i + 1]], 'utf-8', 'surrogatepass')
+            for i in range(len(offsets) - 1)
+        ]
+        frame.reaction_offsets = column["reaction_offsets"]
+        frame.reaction_actor = column["reaction_actor"]
+        frame.reaction_emoji = [emoji[i] for i in column["reaction_emoji"]]
+        conversation = Conversation(
+            title=header["title"],
+            participants=header["participants"],
+            messages=frame,
+        )
+    except (OSError, EOFError, ValueError, KeyError, IndexError, TypeError, struct.error):
+        return None
+
+    # Mark the snapshot as recently used, for eviction
+    try:
+        os.utime(entry)
+    except OSError:
+        pass
+    return conversation
+
+
+class InboxIndex:
+    """Saved chat discovery results for one inbox folder.
+
+    Entries map a chat folder name to its message file fingerprints and the
+    JSON-serializable info found for it (None for folders without messages).
+    Only entries looked up or stored since loading are written back, so chats
+    removed from the inbox drop out of the index.
+    """
+
+    def __init__(self, inbox_path: Path, cache_dir: Path):
+        self.inbox = str(inbox_path.resolve())
+        self.path = cache_dir / f"inbox-{hashlib.sha1(self.inbox.encode('utf-8')).hexdigest()}.jsonl"
+        self._entries: dict[str, dict] = {}
+        self._current: dict[str, dict] = {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                if json.loads(next(f, "null")) != {"version": INDEX_VERSION, "inbox": self.inbox}:
+                    return
+                for line in f:
+                    entry = json.loads(line)
+                    self._entries[entry["folder"]] = entry
+        except (OSError, ValueError, KeyError, TypeError):
+            self._entries = {}
+
+    def lookup(self, folder: str, files: list[Path]) -> tuple[bool, dict | None]:
+        """Return (True, info) if the folder was indexed with these exact files."""
+        entry = self._entries.get(folder)
+        try:
+            if entry is None or entry["sources"] != _sources(files):
+                return False, None
+        except OSError:
+            return False, None
+        self._current[folder] = entry
+        return True, entry["info"]
+
+    def store(self, folder: str, files: list[Path], info: dict | None) -> None:
+        try:
+            self._current[folder] = {"folder": folder, "sources": _sources(files), "info": info}
+        except OSError:
+            pass
+
+    def save(self) -> None:
+        """Write the index back. Failures are ignored, as for snapshots."""
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with _temporary_file(self.path, 'w') as f:
+                f.write(json.dumps({"version": INDEX_VERSION, "inbox": self.inbox}) + "\n")
+                for entry in self._current.values():
+                    f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        except OSError:
+            pass
@@ -2,13 +2,35 @@
 
 import click
 from pathlib import Path
-import sys
 import json
+import os
+import sys
+from contextlib import nullcontext, redirect_stdout
 from datetime import datetime
+from typing import TYPE_CHECKING, Callable
+
+from .parser import (
+    Conversation,
+    IncrementalLoader,
+    find_message_files,
+    load_conversation,
+    scan_message_file,
+)
+from .cache import InboxIndex, default_cache_dir
+
+if TYPE_CHECKING:
+    from .archive import ZipFolder
+    from .profiling import Profiler
+
+# The analyzer, the HTML generator, ZIP support and process pools are imported
+# where they are first used, so --help and listing chats start quickly.
+
 
-from .parser import load_conversation, decode_facebook_encoding
-from .analyzer import analyze_conversation
-from .generator import generate_html
+# Folders of an export that hold only media and never contain the inbox
+MEDIA_FOLDERS = frozenset({"photos", "videos", "gifs", "audio", "files"})
+
+# How deep below the export folder the inbox is searched for
+INBOX_SEARCH_DEPTH = 6
 
 
 def find_inbox_folder(export_path: Path) -> Path | None:
@@ -28,14 +50,70 @@ def find_inbox_folder(export_path: Path) -> Path | None:
         if path.exists() and path.is_dir():
             return path
     
-    # Search recursively for inbox folder
-    for path in export_path.rglob("inbox"):
-        if path.is_dir() and (path / ".." ).resolve().name == "messages":
-            return path
+    # Search the tree for messages/inbox
+    return _search_inbox_folder(export_path)
+
+
+def open_inbox(input_path: Path) -> "Path | ZipFolder | None":
+    """Find the inbox of an extracted export, or else of its ZIP archive(s)."""
+    inbox_path = find_inbox_folder(input_path) if input_path.is_dir() else None
+    if not inbox_path:
+        # Fall back to the export's ZIP archive(s), read without extracting
+        from .archive import open_zip_export, zip_archives
+        
+        archives = zip_archives(input_path)
+        if archives:
+            inbox_path = open_zip_export(archives).find_inbox()
+    return inbox_path
+
+
+def echo_inbox_not_found() -> None:
+    click.echo(click.style("❌ Could not find inbox folder in the export.", fg='red'))
+    click.echo("   Make sure you provided the path to the Facebook export folder or its ZIP file(s).")
+    click.echo("   Expected structure: export/messages/inbox/")
+
+
+def _search_inbox_folder(export_path: Path) -> Path | None:
+    """Breadth-first search for messages/inbox, skipping media trees.
     
+    Uses os.scandir so directory type checks come from the listing itself,
+    stops at the first (shallowest) hit and never descends more than
+    INBOX_SEARCH_DEPTH levels.
+    """
+    level = [export_path]
+    for _ in range(INBOX_SEARCH_DEPTH):
+        next_level = []
+        for folder in level:
+            try:
+                with os.scandir(folder) as entries:
+                    for entry in entries:
+                        if entry.name in MEDIA_FOLDERS or not entry.is_dir():
+                            continue
+                        if entry.name == "inbox" and folder.name == "messages":
+                            return Path(entry.path)
+                        next_level.append(Path(entry.path))
+            except OSError:
+                continue
+        if not next_level:
+            break
+        level = next_level
     return None
 
 
+def _chat_info(chat_folder: Path, title: str, participants: list[str], message_count: int,
+               last_timestamp: int) -> dict:
+    """Build the chat info dict shown in the chat list."""
+    return {
+        "path": chat_folder,
+        "title": title,
+        "participants": participants,
+        "participant_count": len(participants),
+        "message_count": message_count,
+        "last_message": datetime.fromtimestamp(last_timestamp / 1000) if last_timestamp else None,
+        "last_timestamp": last_timestamp,
+    }
+
+
 def get_chat_info(chat_folder: Path) -> dict | None:
     """Get basic info about a chat from its folder."""
     message_files = sorted(chat_folder.glob("message_*.json"))
@@ -43,55 +121,72 @@ def get_chat_info(chat_folder: Path) -> dict | None:
         return None
     
     try:
-        # Load first file for metadata
-        with open(message_files[0], 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        
-        title = decode_facebook_encoding(data.get("title", chat_folder.name))
-        participants = [
-            decode_facebook_encoding(p.get("name", "Unknown"))
-            for p in data.get("participants", [])
-        ]
-        
-        # Get total message count and last message time
-        total_messages = 0
-        last_timestamp = 0
-        
-        for msg_file in message_files:
-            with open(msg_file, 'r', encoding='utf-8') as f:
-                file_data = json.load(f)
-            messages = file_data.get("messages", [])
-            total_messages += len(messages)
-            
-            for msg in messages:
-                ts = msg.get("timestamp_ms", 0)
-                if ts > last_timestamp:
-                    last_timestamp = ts
-        
-        last_date = datetime.fromtimestamp(last_timestamp / 1000) if last_timestamp else None
-        
-        return {
-            "path": chat_folder,
-            "title": title,
-            "participants": participants,
-            "participant_count": len(participants),
-            "message_count": total_messages,
-            "last_message": last_date,
-            "last_timestamp": last_timestamp,
-        }
+        # Metadata comes from the first file; messages are only counted
+        data, total_messages, last_timestamp = scan_message_file(message_files[0])
+        
+        title = data.get("title", chat_folder.name) or ""
+        participants = [p.get("name", "Unknown") or "" for p in data.get("participants", [])]
+        
+        for msg_file in message_files[1:]:
+            _, message_count, file_last_timestamp = scan_message_file(msg_file)
+            total_messages += message_count
+            last_timestamp = max(last_timestamp, file_last_timestamp)
+        
+        return _chat_info(chat_folder, title, participants, total_messages, last_timestamp)
     except Exception as e:
         return None
 
 
-def discover_chats(inbox_path: Path) -> list[dict]:
-    """Discover all chats in the inbox folder."""
-    chats = []
+def _discover_chat(chat_folder: Path, index: InboxIndex | None) -> dict | None:
+    """Get a chat's info, from the inbox index when its files are unchanged."""
+    if index is None:
+        return get_chat_info(chat_folder)
     
-    for item in inbox_path.iterdir():
-        if item.is_dir():
-            info = get_chat_info(item)
-            if info and info["message_count"] > 0:
-                chats.append(info)
+    message_files = sorted(chat_folder.glob("message_*.json"))
+    found, saved = index.lookup(chat_folder.name, message_files)
+    if found:
+        return _chat_info(chat_folder, **saved) if saved else None
+    
+    info = get_chat_info(chat_folder)
+    index.store(chat_folder.name, message_files, info and {
+        key: info[key] for key in ("title", "participants", "message_count", "last_timestamp")
+    })
+    return info
+
+
+def discover_chats(inbox_path: Path, cache_dir: Path | None = None, workers: int = 1,
+                   progress: Callable[[int, int], None] | None = None) -> list[dict]:
+    """Discover all chats in the inbox folder.
+    
+    With a cache directory, chats whose message files are unchanged since the
+    last run are taken from the saved inbox index instead of being rescanned.
+    Chat folders are scanned by a pool of ``workers`` threads (0 = the
+    ThreadPoolExecutor default); ``progress`` is called with (done, total)
+    after each one.
+    """
+    index = InboxIndex(inbox_path, cache_dir) if cache_dir is not None else None
+    folders = [item for item in inbox_path.iterdir() if item.is_dir()]
+    infos: list[dict | None] = [None] * len(folders)
+    
+    if workers == 1:
+        for i, folder in enumerate(folders):
+            infos[i] = _discover_chat(folder, index)
+            if progress:
+                progress(i + 1, len(folders))
+    else:
+        from concurrent.futures import ThreadPoolExecutor, as_completed
+        
+        with ThreadPoolExecutor(max_workers=workers or None) as executor:
+            futures = {executor.submit(_discover_chat, folder, index): i for i, folder in enumerate(folders)}
+            for done, future in enumerate(as_completed(futures), 1):
+                infos[futures[future]] = future.result()
+                if progress:
+                    progress(done, len(folders))
+    
+    if index is not None:
+        index.save()
+    
+    chats = [info for info in infos if info and info["message_count"] > 0]
     
     # Sort by last message timestamp (most recent first)
     chats.sort(key=lambda x: x["last_timestamp"], reverse=True)
@@ -99,13 +194,215 @@ def discover_chats(inbox_path: Path) -> list[dict]:
     return chats
 
 
-@click.command()
+def print_profile(profiler: "Profiler") -> None:
+    """Stop the profiler and print its stage timings.
+    
+    For a category, ``scan`` is the time its hooks took in the message scan
+    and ``wall`` the time its finalization took.
+    """
+    profiler.finish()
+    click.echo()
+    click.echo(click.style("⏱️  Profile:", fg='cyan'))
+    width = max([28] + [2 * timing.depth + len(timing.name) for timing in profiler.iter_stages()])
+    click.echo(f"   {'stage':<{width}} {'scan':>9} {'wall':>9} {'cpu':>9} {'peak RSS':>11} {'growth':>11}")
+    for timing in profiler.iter_stages():
+        name = "  " * timing.depth + timing.name
+        scan = f"{timing.scan:8.3f}s" if timing.scan is not None else ""
+        click.echo(f"   {name:<{width}} {scan:>9} {timing.wall:8.3f}s {timing.cpu:8.3f}s "
+                   f"{timing.peak_rss / 2**20:7.1f} MiB {timing.rss_growth / 2**20:+7.1f} MiB")
+    if profiler.pstats_path:
+        click.echo(f"   📄 cProfile stats: {profiler.pstats_path} (python -m pstats {profiler.pstats_path})")
+
+
+def chats_to_json(chats: list[dict]) -> str:
+    """Serialize discovered chats for --list --format json, numbered as for --chat."""
+    return json.dumps([
+        {
+            "number": number,
+            "title": chat_info["title"],
+            "participants": chat_info["participants"],
+            "participant_count": chat_info["participant_count"],
+            "message_count": chat_info["message_count"],
+            "last_message": chat_info["last_message"].isoformat() if chat_info["last_message"] else None,
+            "last_timestamp": chat_info["last_timestamp"],
+            "path": str(chat_info["path"]),
+        }
+        for number, chat_info in enumerate(chats, 1)
+    ], ensure_ascii=False, indent=2)
+
+
+def watch_chat(loader: IncrementalLoader, rebuild: Callable[[Conversation], None], debounce: float) -> None:
+    """Rebuild a chat's report whenever its message files change, until Ctrl+C.
+    
+    Only the changed files are re-parsed (see ``IncrementalLoader``). A file
+    caught half-written fails to parse; the next write triggers a retry.
+    ``rebuild`` can likewise analyze only new messages (see ``IncrementalAnalyzer``).
+    """
+    from .watch import open_watcher, wait_for_changes
+    
+    folder = find_message_files(loader.path)[0].parent
+    watcher = open_watcher(folder)
+    click.echo(f"👀 Watching {folder} for changes (Ctrl+C to stop)...")
+    try:
+        while True:
+            wait_for_changes(watcher, debounce)
+            try:
+                conversation, reparsed = loader.load()
+                rebuild(conversation)
+            except Exception as e:
+                click.echo(click.style(f"❌ Rebuild failed: {e}", fg='red'))
+                continue
+            click.echo(click.style(
+                f"🔄 {datetime.now():%H:%M:%S} Rebuilt: {len(reparsed)} file(s) re-parsed, "
+                f"{len(conversation.messages):,} messages",
+                fg='green'
+            ))
+    except KeyboardInterrupt:
+        click.echo()
+    finally:
+        watcher.close()
+
+
+def output_filename(title: str) -> str:
+    """Create a safe HTML filename from a chat title."""
+    safe_title = "".join(c if c.isalnum() or c in (' ', '-', '_') else '_' for c in title)
+    safe_title = safe_title.replace(' ', '_')[:50]
+    return f"{safe_title}_wrapped.html"
+
+
+def parse_categories(ctx: click.Context, param: click.Parameter, value: str | None) -> list[str] | None:
+    """Click callback: a comma-separated list of category ids known to the analyzer."""
+    if value is None:
+        return None
+    from .analyzer import select_accumulators
+    
+    categories = [category_id.strip() for category_id in value.split(",") if category_id.strip()]
+    try:
+        select_accumulators(categories)
+    except ValueError as e:
+        raise click.BadParameter(str(e))
+    return categories
+
+
+def render_chat(chat_path: Path, output: Path, cache_dir: Path | None,
+                categories: list[str] | None = None) -> int:
+    """Load, analyze and render one chat; returns the number of categories (batch worker)."""
+    from .analyzer import analyze_conversation
+    from .generator import generate_html
+    
+    conversation = load_conversation(chat_path, cache_dir=cache_dir)
+    result = analyze_conversation(conversation, categories=categories)
+    generate_html(result, output)
+    return len(result.categories)
+
+
+def generate_batch(chats: list[dict], output_dir: Path, jobs: int, cache_dir: Path | None,
+                   categories: list[str] | None = None) -> Path:
+    """Generate a Wrapped for every chat, plus an index page linking them.
+    
+    Chats are rendered by ``jobs`` worker processes (0 = all CPUs, 1 = in
+    this process). A chat that fails is reported and left out of the index.
+    """
+    output_dir.mkdir(parents=True, exist_ok=True)
+    
+    # Give every chat its own file, even when titles collide
+    outputs = []
+    used = set()
+    for chat_info in chats:
+        name = output_filename(chat_info["title"])
+        stem = name.removesuffix(".html")
+        n = 2
+        while name in used:
+            name = f"{stem}_{n}.html"
+            n += 1
+        used.add(name)
+        outputs.append(output_dir / name)
+    
+    def report(chat_info: dict, output: Path, category_count: int | None, error: Exception | None) -> None:
+        if error is None:
+            click.echo(f"   ✅ {chat_info['title']}: {output.name} ({category_count} categories)")
+        else:
+            click.echo(click.style(f"   ❌ {chat_info['title']}: {error}", fg='red'))
+    
+    rendered = [False] * len(chats)
+    if jobs == 1:
+        for i, (chat_info, output) in enumerate(zip(chats, outputs)):
+            try:
+                category_count = render_chat(chat_info["path"], output, cache_dir, categories)
+            except Exception as e:
+                report(chat_info, output, None, e)
+            else:
+                report(chat_info, output, category_count, None)
+                rendered[i] = True
+    else:
+        from concurrent.futures import ProcessPoolExecutor, as_completed
+        
+        with ProcessPoolExecutor(max_workers=jobs or None) as executor:
+            futures = {
+                executor.submit(render_chat, chat_info["path"], output, cache_dir, categories): i
+                for i, (chat_info, output) in enumerate(zip(chats, outputs))
+            }
+            for future in as_completed(futures):
+                i = futures[future]
+                try:
+                    category_count = future.result()
+                except Exception as e:
+                    report(chats[i], outputs[i], None, e)
+                else:
+                    report(chats[i], outputs[i], category_count, None)
+                    rendered[i] = True
+    
+    from .generator import generate_index_html
+    
+    index_path = output_dir / "index.html"
+    generate_index_html([
+        {
+            "title": chat_info["title"],
+            "file": output.name,
+            "message_count": chat_info["message_count"],
+            "participant_count": chat_info["participant_count"],
+            "last_message": chat_info["last_message"],
+        }
+        for chat_info, output, ok in zip(chats, outputs, rendered) if ok
+    ], index_path)
+    return index_path
+
+
+class DefaultCommandGroup(click.Group):
+    """A group that runs its default command unless a subcommand is named first.
+    
+    Keeps ``groupchat-wrapped PATH [OPTIONS]`` working alongside subcommands
+    such as ``groupchat-wrapped serve PATH``. A leading help option, or no
+    arguments at all, shows the group's own help with the list of commands.
+    """
+    
+    def __init__(self, *args, default_command: str, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.default_command = default_command
+    
+    def parse_args(self, ctx: click.Context, args: list[str]) -> list[str]:
+        if args and args[0] not in self.commands and args[0] not in ctx.help_option_names:
+            args = [self.default_command, *args]
+        return super().parse_args(ctx, args)
+
+
+@click.group(cls=DefaultCommandGroup, default_command='generate',
+             context_settings={'help_option_names': ['-h', '--help']})
+def main():
+    """Generate a "Group Chat Wrapped" from a Facebook Messenger export.
+    
+    Without a command, runs generate: groupchat-wrapped PATH [OPTIONS].
+    See groupchat-wrapped generate --help for its options.
+    """
+
+
+@main.command()
 @click.argument('input_path', type=click.Path(exists=True, path_type=Path))
 @click.option(
     '-o', '--output',
     type=click.Path(path_type=Path),
     default=None,
-    help='Output HTML file path. Default: output/<chat_name>_wrapped.html'
+    help='Output HTML file path (output folder in batch mode). Default: output/<chat_name>_wrapped.html'
 )
 @click.option(
     '--open/--no-open',
@@ -118,11 +415,108 @@ def discover_chats(inbox_path: Path) -> list[dict]:
     default=None,
     help='Chat number to select (skip interactive selection)'
 )
-def main(input_path: Path, output: Path | None, open: bool, chat: int | None):
+@click.option(
+    '-j', '--jobs',
+    type=click.IntRange(min=0),
+    default=1,
+    show_default=True,
+    help='Worker processes for parsing and analyzing the chat, or for chats in batch mode (0 = all CPUs)'
+)
+@click.option(
+    '--list', 'list_chats',
+    is_flag=True,
+    help='List the discovered chats (after any batch filters) and exit'
+)
+@click.option(
+    '--format', 'output_format',
+    type=click.Choice(['text', 'json']),
+    default='text',
+    show_default=True,
+    help='Format of the --list output'
+)
+@click.option(
+    '--emit-json',
+    type=click.Path(dir_okay=False, allow_dash=True, path_type=Path),
+    default=None,
+    help='Write the analysis result as JSON to this file ("-" for stdout) instead of generating HTML'
+)
+@click.option(
+    '--all', 'all_chats',
+    is_flag=True,
+    help='Batch mode: generate a Wrapped for every chat, plus an index page'
+)
+@click.option(
+    '--filter', 'title_filter',
+    default=None,
+    help='Batch mode: only chats whose title contains this text'
+)
+@click.option(
+    '--groups-only',
+    is_flag=True,
+    help='Batch mode: only group chats (more than 2 participants)'
+)
+@click.option(
+    '--min-messages',
+    type=click.IntRange(min=0),
+    default=0,
+    help='Batch mode: only chats with at least this many messages'
+)
+@click.option(
+    '--scan-workers',
+    type=click.IntRange(min=0),
+    default=0,
+    help='Threads scanning chat folders during discovery (0 = automatic, 1 = serial)'
+)
+@click.option(
+    '--cache/--no-cache',
+    default=True,
+    help='Reuse the chat list and parsed conversations while their files are unchanged'
+)
+@click.option(
+    '--cache-dir',
+    type=click.Path(file_okay=False, path_type=Path),
+    default=None,
+    help='Cache directory. Default: $XDG_CACHE_HOME/groupchat-wrapped'
+)
+@click.option(
+    '--categories',
+    callback=parse_categories,
+    default=None,
+    help='Comma-separated category ids to compute (e.g. spam_king,night_owl,summary). Default: all'
+)
+@click.option(
+    '--watch',
+    is_flag=True,
+    help='Keep running and rebuild the output whenever the chat\'s message files change'
+)
+@click.option(
+    '--debounce',
+    type=click.FloatRange(min=0),
+    default=1.0,
+    show_default=True,
+    help='Seconds of quiet after a change before --watch rebuilds'
+)
+@click.option(
+    '--profile',
+    is_flag=True,
+    help='Print wall time, CPU time and peak memory of each stage and analyzer category'
+)
+@click.option(
+    '--profile-output',
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=None,
+    help='Also write a cProfile dump of the run to this file (implies --profile)'
+)
+def generate(input_path: Path, output: Path | None, open: bool, chat: int | None, jobs: int,
+             list_chats: bool, output_format: str, emit_json: Path | None, all_chats: bool,
+             title_filter: str | None, groups_only: bool, min_messages: int, scan_workers: int,
+             cache: bool, cache_dir: Path | None, categories: list[str] | None, watch: bool,
+             debounce: float, profile: bool, profile_output: Path | None):
     """
     Generate a "Group Chat Wrapped" from a Facebook Messenger export.
     
-    INPUT_PATH: Path to the Facebook export folder (will auto-discover chats).
+    INPUT_PATH: Path to the Facebook export folder (will auto-discover chats),
+    an export ZIP file, or a folder holding all ZIP parts of a split export.
     
     Examples:
     
@@ -130,36 +524,119 @@ def main(input_path: Path, output: Path | None, open: bool, chat: int | None):
         
         groupchat-wrapped /path/to/facebook-export/ -c 1
         
+        groupchat-wrapped /path/to/facebook-export.zip
+        
         groupchat-wrapped /path/to/facebook-export/ -o output/wrapped.html
+        
+        groupchat-wrapped /path/to/facebook-export/ -c 1 --jobs 8
+        
+        groupchat-wrapped /path/to/facebook-export/ --groups-only --min-messages 1000 -j 0
+        
+        groupchat-wrapped /path/to/facebook-export/ --list --format json
+        
+        groupchat-wrapped /path/to/facebook-export/ -c 1 --emit-json -
+        
+        groupchat-wrapped /path/to/facebook-export/ -c 1 --categories spam_king,night_owl,summary
+    
+    Any of --all, --filter, --groups-only or --min-messages selects batch
+    mode, which writes every matching chat and an index.html to the output
+    folder.
+    
+    To host the reports of all chats over HTTP, see
+    `groupchat-wrapped serve --help`.
     """
+    # Machine-readable output owns stdout; everything else goes to stderr
+    json_out = sys.stdout
+    if (list_chats and output_format == 'json') or str(emit_json) == '-':
+        click.get_current_context().with_resource(redirect_stdout(sys.stderr))
+    
     click.echo(click.style("🎉 Group Chat Wrapped Generator", fg='magenta', bold=True))
     click.echo()
     
+    if not cache:
+        cache_dir = None
+    elif cache_dir is None:
+        cache_dir = default_cache_dir()
+    
+    if profile or profile_output:
+        from .profiling import Profiler
+        profiler = Profiler(profile_output)
+        stage = profiler.stage
+    else:
+        profiler = None
+        stage = lambda name: nullcontext()
+    
+    batch = all_chats or title_filter is not None or groups_only or min_messages > 0
+    if batch and emit_json and not list_chats:
+        click.echo(click.style("❌ --emit-json works with a single chat, not batch mode.", fg='red'))
+        sys.exit(1)
+    if watch and (batch or list_chats or str(emit_json) == '-'):
+        click.echo(click.style("❌ --watch works with a single chat written to a file.", fg='red'))
+        sys.exit(1)
+    
     # Check if input is a direct chat folder (has message_*.json files)
     if list(input_path.glob("message_*.json")):
+        if batch or list_chats:
+            click.echo(click.style("❌ Batch mode and --list need an export or inbox folder, not a single chat.", fg='red'))
+            sys.exit(1)
+        
         # Direct chat folder provided
         chat_path = input_path
         click.echo(f"📂 Loading conversation from: {input_path}")
     else:
         # Try to find inbox folder and list chats
-        inbox_path = find_inbox_folder(input_path)
+        with stage("find inbox"):
+            inbox_path = open_inbox(input_path)
         
         if not inbox_path:
-            click.echo(click.style("❌ Could not find inbox folder in the export.", fg='red'))
-            click.echo("   Make sure you provided the path to the Facebook export folder.")
-            click.echo("   Expected structure: export/messages/inbox/")
+            echo_inbox_not_found()
             sys.exit(1)
         
         click.echo(f"📂 Found inbox folder: {inbox_path}")
-        click.echo("🔍 Discovering chats...")
-        click.echo()
         
-        chats = discover_chats(inbox_path)
+        def show_progress(done: int, total: int) -> None:
+            click.echo(f"\r🔍 Discovering chats... {done}/{total}", nl=False)
+        
+        click.echo("🔍 Discovering chats...", nl=False)
+        with stage("discover chats"):
+            chats = discover_chats(inbox_path, cache_dir, workers=scan_workers, progress=show_progress)
+        click.echo()
+        click.echo()
         
         if not chats:
             click.echo(click.style("❌ No chats found in the inbox folder.", fg='red'))
             sys.exit(1)
         
+        if batch:
+            chats = [
+                chat_info for chat_info in chats
+                if (title_filter is None or title_filter.lower() in chat_info["title"].lower())
+                and (not groups_only or chat_info["participant_count"] > 2)
+                and chat_info["message_count"] >= min_messages
+            ]
+            if not chats:
+                click.echo(click.style("❌ No chats match the batch filters.", fg='red'))
+                sys.exit(1)
+        
+        if list_chats and output_format == 'json':
+            json_out.write(chats_to_json(chats) + "\n")
+            return
+        
+        if batch and not list_chats:
+            output_dir = output or Path("output")
+            click.echo(click.style(f"📦 Generating {len(chats)} chats into {output_dir}/", fg='cyan'))
+            with stage("batch"):
+                index_path = generate_batch(chats, output_dir, jobs, cache_dir, categories)
+            click.echo()
+            click.echo(click.style(f"✅ Index: {index_path.absolute()}", fg='green'))
+            click.echo(click.style("🎉 Done! Enjoy your Group Chat Wrapped!", fg='magenta', bold=True))
+            if profiler:
+                print_profile(profiler)
+            if open:
+                import webbrowser
+                webbrowser.open(f"file://{index_path.absolute()}")
+            return
+        
         # Display chat list
         click.echo(click.style(f"📋 Found {len(chats)} chats:", fg='cyan'))
         click.echo()
@@ -180,6 +657,9 @@ def main(input_path: Path, output: Path | None, open: bool, chat: int | None):
             click.echo(f"       💬 {chat_info['message_count']:,} messages | 📅 Last: {last_msg} | 👥 {chat_info['participant_count']}")
             click.echo()
         
+        if list_chats:
+            return
+        
         # Get user selection
         if chat is not None:
             selection = chat
@@ -202,10 +682,19 @@ def main(input_path: Path, output: Path | None, open: bool, chat: int | None):
         click.echo(f"✅ Selected: {click.style(selected_chat['title'], fg='green', bold=True)}")
         click.echo()
     
+    if watch and not isinstance(chat_path, Path):
+        click.echo(click.style("❌ --watch needs an extracted export; ZIP archives are not watched.", fg='red'))
+        sys.exit(1)
+    
     # Load conversation
     click.echo(f"📂 Loading conversation...")
+    loader = IncrementalLoader(chat_path) if watch else None
     try:
-        conversation = load_conversation(chat_path)
+        with stage("load"):
+            if loader:
+                conversation, _ = loader.load()
+            else:
+                conversation = load_conversation(chat_path, jobs=jobs, cache_dir=cache_dir)
     except Exception as e:
         click.echo(click.style(f"❌ Error loading conversation: {e}", fg='red'))
         sys.exit(1)
@@ -216,38 +705,157 @@ def main(input_path: Path, output: Path | None, open: bool, chat: int | None):
     click.echo()
     
     # Analyze
+    from .analyzer import IncrementalAnalyzer, analyze_conversation, result_to_json
+    from .generator import generate_html
+    
     click.echo("🔍 Analyzing conversation...")
-    result = analyze_conversation(conversation)
+    # Watch rebuilds analyze only the messages added since the last analysis
+    incremental = IncrementalAnalyzer(categories, jobs) if loader else None
+    with stage("analyze"):
+        if incremental:
+            result = incremental.analyze(conversation, profiler)
+        else:
+            result = analyze_conversation(conversation, profiler, categories, jobs)
     click.echo(click.style(f"✅ Found {len(result.categories)} categories!", fg='green'))
     click.echo()
     
-    # Generate HTML
-    if output is None:
-        # Create safe filename from chat title
-        safe_title = "".join(c if c.isalnum() or c in (' ', '-', '_') else '_' for c in conversation.title)
-        safe_title = safe_title.replace(' ', '_')[:50]
-        output = Path("output") / f"{safe_title}_wrapped.html"
-        output.parent.mkdir(parents=True, exist_ok=True)
-    
-    click.echo(f"🎨 Generating HTML: {output}")
-    generate_html(result, output)
-    click.echo(click.style(f"✅ Generated: {output.absolute()}", fg='green'))
-    click.echo()
-    
-    # Print summary of categories
-    click.echo(click.style("📊 Categories generated:", fg='cyan'))
-    for cat in result.categories:
-        winner_info = cat.winner if cat.winner else "Multiple winners"
-        click.echo(f"   {cat.icon} {cat.title}: {winner_info}")
+    if emit_json:
+        if str(emit_json) == '-':
+            json_out.write(result_to_json(result) + "\n")
+        else:
+            emit_json.write_text(result_to_json(result) + "\n", encoding='utf-8')
+            click.echo(click.style(f"✅ Wrote analysis JSON: {emit_json.absolute()}", fg='green'))
+    else:
+        # Generate HTML
+        if output is None:
+            output = Path("output") / output_filename(conversation.title)
+            output.parent.mkdir(parents=True, exist_ok=True)
+        
+        click.echo(f"🎨 Generating HTML: {output}")
+        with stage("render"):
+            generate_html(result, output)
+        click.echo(click.style(f"✅ Generated: {output.absolute()}", fg='green'))
+        click.echo()
+        
+        # Print summary of categories
+        click.echo(click.style("📊 Categories generated:", fg='cyan'))
+        for cat in result.categories:
+            winner_info = cat.winner if cat.winner else "Multiple winners"
+            click.echo(f"   {cat.icon} {cat.title}: {winner_info}")
+        
+        click.echo()
+        click.echo(click.style("🎉 Done! Enjoy your Group Chat Wrapped!", fg='magenta', bold=True))
     
-    click.echo()
-    click.echo(click.style("🎉 Done! Enjoy your Group Chat Wrapped!", fg='magenta', bold=True))
+    if profiler:
+        print_profile(profiler)
     
     # Open in browser
-    if open:
+    if open and not emit_json:
         import webbrowser
         webbrowser.open(f"file://{output.absolute()}")
+    
+    if loader:
+        def rebuild(conversation: Conversation) -> None:
+            result = incremental.analyze(conversation)
+            if emit_json:
+                emit_json.write_text(result_to_json(result) + "\n", encoding='utf-8')
+            else:
+                generate_html(result, output)
+        
+        click.echo()
+        watch_chat(loader, rebuild, debounce)
+
 
+@main.command()
+@click.argument('input_path', type=click.Path(exists=True, path_type=Path))
+@click.option(
+    '--host',
+    default='127.0.0.1',
+    show_default=True,
+    help='Address to listen on (0.0.0.0 for all interfaces)'
+)
+@click.option(
+    '--port',
+    type=click.IntRange(0, 65535),
+    default=8000,
+    show_default=True,
+    help='Port to listen on'
+)
+@click.option(
+    '--memory-limit',
+    type=click.IntRange(min=1),
+    default=256,
+    show_default=True,
+    help='MiB of analyses and rendered reports kept in memory'
+)
+@click.option(
+    '--scan-workers',
+    type=click.IntRange(min=0),
+    default=0,
+    help='Threads scanning chat folders during discovery (0 = automatic, 1 = serial)'
+)
+@click.option(
+    '--cache/--no-cache',
+    default=True,
+    help='Reuse the chat list and parsed conversations while their files are unchanged'
+)
+@click.option(
+    '--cache-dir',
+    type=click.Path(file_okay=False, path_type=Path),
+    default=None,
+    help='Cache directory. Default: $XDG_CACHE_HOME/groupchat-wrapped'
+)
+def serve(input_path: Path, host: str, port: int, memory_limit: int, scan_workers: int, cache: bool,
+          cache_dir: Path | None):
+    """
+    Serve the Wrapped reports of every chat in an export over HTTP.
+    
+    INPUT_PATH: Path to the Facebook export folder, an export ZIP file, or a
+    folder holding all ZIP parts of a split export.
+    
+    The index page lists the chats; each chat is analyzed when it is first
+    opened and kept in memory (least recently used first out) up to
+    --memory-limit. Unchanged reports are revalidated with ETags.
+    
+    Examples:
+    
+        groupchat-wrapped serve /path/to/facebook-export/
+        
+        groupchat-wrapped serve /path/to/facebook-export.zip --host 0.0.0.0 --port 8080
+    """
+    from .server import ReportServer
+    
+    click.echo(click.style("🎉 Group Chat Wrapped Server", fg='magenta', bold=True))
+    click.echo()
+    
+    if not cache:
+        cache_dir = None
+    elif cache_dir is None:
+        cache_dir = default_cache_dir()
+    
+    inbox_path = open_inbox(input_path)
+    if not inbox_path:
+        echo_inbox_not_found()
+        sys.exit(1)
+    click.echo(f"📂 Found inbox folder: {inbox_path}")
+    
+    server = ReportServer(
+        (host, port),
+        lambda: discover_chats(inbox_path, cache_dir, workers=scan_workers),
+        memory_limit=memory_limit * 2**20,
+        cache_dir=cache_dir,
+    )
+    click.echo("🔍 Discovering chats...")
+    chats = server.refresh_chats()
+    click.echo(click.style(f"📋 Found {len(chats)} chats", fg='cyan'))
+    click.echo()
+    click.echo(click.style(f"🌐 Serving on http://{host}:{server.server_address[1]}/ (Ctrl+C to stop)", fg='green'))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        click.echo()
+    finally:
+        server.server_close()
 
 if __name__ == '__main__':
     main()
@@ -1,13 +1,20 @@
 """HTML generator for Group Chat Wrapped."""
 
+from html import escape
 from pathlib import Path
+from urllib.parse import quote
 from .analyzer import AnalysisResult, CategoryResult
 
 
 def generate_html(result: AnalysisResult, output_path: Path) -> None:
     """Generate an HTML presentation from analysis results."""
+    output_path.write_text(render_html(result), encoding='utf-8')
+
+
+def render_html(result: AnalysisResult) -> str:
+    """Render the HTML presentation of analysis results."""
     
-    html_content = f'''<!DOCTYPE html>
+    return f'''<!DOCTYPE html>
 <html lang="pl">
 <head>
     <meta charset="UTF-8">
@@ -1802,8 +1809,6 @@ def generate_html(result: AnalysisResult, output_path: Path) -> None:
     </script>
 </body>
 </html>'''
-    
-    output_path.write_text(html_content, encoding='utf-8')
 
 
 def generate_graph_slide(cat: CategoryResult) -> str:
@@ -2087,3 +2092,115 @@ def generate_slides(categories: list[CategoryResult]) -> str:
         slides_html.append(slide)
     
     return '\n'.join(slides_html)
+
+
+def generate_index_html(entries: list[dict], output_path: Path) -> None:
+    """Generate an index page linking the Wrapped presentations of a batch run."""
+    output_path.write_text(render_index_html(entries), encoding='utf-8')
+
+
+def render_index_html(entries: list[dict]) -> str:
+    """Render an index page linking Wrapped presentations.
+
+    Each entry has the chat "title", the presentation "file" relative to the
+    index, and its "message_count", "participant_count" and "last_message".
+    """
+    cards = ""
+    for entry in entries:
+        last_message = entry["last_message"].strftime("%d.%m.%Y") if entry["last_message"] else "-"
+        badge = '<span class="badge">GRUPA</span>' if entry["participant_count"] > 2 else ''
+        cards += f'''
+            <a class="card" href="{quote(entry['file'])}">
+                <span class="card-title">{escape(entry['title'])}{badge}</span>
+                <span class="card-stats">💬 {entry['message_count']:,} wiadomości · 👥 {entry['participant_count']} · 📅 {last_message}</span>
+            </a>'''
+    
+    return f'''<!DOCTYPE html>
+<html lang="pl">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <meta name="theme-color" content="#1a1a2e">
+    <title>Group Chat Wrapped 2025</title>
+    <link rel="icon" href="data:image/svg+xml,<svg xmlns='http://www.w3.org/2000/svg' viewBox='0 0 100 100'><text y='.9em' font-size='90'>🎁</text></svg>">
+    <link href="https://fonts.googleapis.com/css2?family=Poppins:wght@400;600;700;900&display=swap" rel="stylesheet">
+    <style>
+        * {{
+            margin: 0;
+            padding: 0;
+            box-sizing: border-box;
+        }}
+
+        body {{
+            font-family: 'Poppins', sans-serif;
+            background: linear-gradient(135deg, #1a1a2e 0%, #16213e 50%, #0f3460 100%);
+            min-height: 100vh;
+            color: white;
+            padding: 60px 20px;
+        }}
+
+        h1 {{
+            text-align: center;
+            font-size: 2.5rem;
+            font-weight: 900;
+            margin-bottom: 40px;
+            background: linear-gradient(135deg, #f093fb 0%, #f5576c 50%, #4facfe 100%);
+            -webkit-background-clip: text;
+            -webkit-text-fill-color: transparent;
+        }}
+
+        .cards {{
+            max-width: 800px;
+            margin: 0 auto;
+            display: flex;
+            flex-direction: column;
+            gap: 16px;
+        }}
+
+        .card {{
+            display: flex;
+            flex-direction: column;
+            gap: 6px;
+            padding: 20px 24px;
+            border-radius: 16px;
+            background: rgba(255, 255, 255, 0.08);
+            border: 1px solid rgba(255, 255, 255, 0.1);
+            color: white;
+            text-decoration: none;
+            transition: transform 0.2s, background 0.2s;
+        }}
+
+        .card:hover {{
+            transform: translateY(-2px);
+            background: rgba(255, 255, 255, 0.14);
+        }}
+
+        .card-title {{
+            font-size: 1.2rem;
+            font-weight: 700;
+        }}
+
+        .card-stats {{
+            font-size: 0.9rem;
+            opacity: 0.7;
+        }}
+
+        .badge {{
+            margin-left: 10px;
+            padding: 2px 8px;
+            border-radius: 8px;
+            font-size: 0.7rem;
+            background: #43e97b;
+            color: #1a1a2e;
+            vertical-align: middle;
+        }}
+    </style>
+</head>
+<body>
+    <h1>🎁 Group Chat Wrapped 2025</h1>
+    <div class="cards">
+        {cards}
+    </div>
+</body>
+</html>
+'''
@@ -2,44 +2,379 @@
 
 import json
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterable, Iterator, TextIO
+from array import array
 from dataclasses import dataclass
 from datetime import datetime
+from itertools import groupby, islice
+import heapq
 import os
+import re
+
+
+# Size of each read when streaming message files
+STREAM_CHUNK_SIZE = 1 << 16
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+# A character that can follow a complete JSON value
+_VALUE_END = re.compile(r'[ \t\n\r,\]}]')
+
+# A run of U+0080-U+00FF characters in a decoded string - Facebook writes each
+# UTF-8 byte of a character as one \u00XX escape
+_MOJIBAKE_RUN = re.compile('[\x80-\xff]+')
+
+# A top-level key in Facebook's two-space indented layout; keys nested in
+# messages are indented deeper and string values cannot contain raw newlines
+_TOP_LEVEL_KEY = re.compile(rb'\n  "([^"\\]+)"\s*:\s*')
+_TIMESTAMP_MS = re.compile(rb'"timestamp_ms"\s*:\s*(-?\d+)')
+
+# Every message_type the loader can produce; the index is the type's code
+MESSAGE_TYPES = (
+    "text", "photo", "video", "audio", "gif", "sticker", "share",
+    "call", "name_change", "photo_change",
+)
+_TYPE_CODES = {name: code for code, name in enumerate(MESSAGE_TYPES)}
+
+# Phrases that turn a text message into a group event, by message type, in
+# priority order. Phrases are matched case-insensitively; add other export
+# languages here or with SYSTEM_MESSAGES.add().
+SYSTEM_MESSAGE_PHRASES: dict[str, list[str]] = {
+    "name_change": [
+        'named the group', 'changed the group name',
+        'nazwał grupę', 'nadał grupie nazwę', 'zmienił nazwę grupy',
+        'zmienił(-a) nazwę grupy', 'nadał(-a) grupie nazwę',
+    ],
+    "photo_change": [
+        'changed the group photo', 'set the group photo',
+        'removed the group photo', 'zmienił zdjęcie grupy',
+        'ustawił zdjęcie grupy', 'usunął zdjęcie grupy',
+        'zmienił(-a) zdjęcie grupy',
+    ],
+}
 
 
 @dataclass
 class Message:
-    """Represents a single message in the chat."""
+    """Represents a single message in the chat.
+    
+    ``ConversationFrame`` stores messages column-wise and only builds these
+    as row views when a message is indexed or iterated.
+    """
     sender: str
     content: str
     timestamp: datetime
-    message_type: str  # text, photo, video, audio, gif, sticker, share, name_change, photo_change
+    message_type: str  # one of MESSAGE_TYPES
     reactions: list[dict]
+    sender_id: int = -1  # index into ConversationFrame.names, when known
+
+
+class ConversationFrame:
+    """Struct-of-arrays storage for the messages of a conversation.
+    
+    Row ``i`` is spread across parallel columns: ``timestamp_ms[i]``,
+    ``sender_id[i]``, ``type_code[i]`` (index into ``MESSAGE_TYPES``) and
+    ``content[i]``. Its reactions are ``reaction_actor``/``reaction_emoji`` in
+    the range ``reaction_offsets[i]:reaction_offsets[i + 1]``.
+    
+    Senders and reaction actors are interned into one participant table,
+    ``names``; ``sender_id`` and ``reaction_actor`` hold indexes into it
+    (``-1`` for a reaction without an actor).
+    
+    The frame is also a read-only sequence of ``Message`` row views, so code
+    written against ``list[Message]`` keeps working.
+    """
+    
+    def __init__(self):
+        self.names: list[str] = []
+        self.timestamp_ms = array('q')
+        self.sender_id = array('i')
+        self.type_code = array('B')
+        self.content: list[str] = []
+        self.reaction_offsets = array('q', [0])
+        self.reaction_actor = array('i')
+        self.reaction_emoji: list[str] = []
+        self._name_ids: dict[str, int] = {}
     
+    @classmethod
+    def from_messages(cls, messages: list[Message]) -> "ConversationFrame":
+        """Build a frame from ``Message`` objects."""
+        frame = cls()
+        for msg in messages:
+            frame.append(
+                msg.sender, msg.content, round(msg.timestamp.timestamp() * 1000),
+                msg.message_type, msg.reactions,
+            )
+        return frame
     
-@dataclass  
+    def intern_name(self, name: str) -> int:
+        """Return the participant id for a name, adding it to ``names`` if new."""
+        name_id = self._name_ids.get(name)
+        if name_id is None:
+            name_id = self._name_ids[name] = len(self.names)
+            self.names.append(name)
+        return name_id
+    
+    def name_id(self, name: str) -> int:
+        """Return the participant id for a name, or -1 if it never appears."""
+        return self._name_ids.get(name, -1)
+    
+    def append(self, sender: str, content: str, timestamp_ms: int, message_type: str,
+               reactions: list[dict]) -> None:
+        """Append one message as a new row."""
+        self.timestamp_ms.append(timestamp_ms)
+        self.sender_id.append(self.intern_name(sender))
+        self.type_code.append(_TYPE_CODES[message_type])
+        self.content.append(content)
+        for reaction in reactions:
+            actor = reaction.get("actor")
+            self.reaction_actor.append(self.intern_name(actor) if actor else -1)
+            self.reaction_emoji.append(reaction.get("reaction", ""))
+        self.reaction_offsets.append(len(self.reaction_actor))
+    
+    def extend(self, other: "ConversationFrame") -> None:
+        """Append every row of another frame."""
+        remap = [self.intern_name(name) for name in other.names]
+        base = self.reaction_offsets[-1]
+        self.timestamp_ms.extend(other.timestamp_ms)
+        self.sender_id.extend(remap[sender_id] for sender_id in other.sender_id)
+        self.type_code.extend(other.type_code)
+        self.content.extend(other.content)
+        self.reaction_offsets.extend(base + offset for offset in other.reaction_offsets[1:])
+        self.reaction_actor.extend(remap[actor] if actor >= 0 else -1 for actor in other.reaction_actor)
+        self.reaction_emoji.extend(other.reaction_emoji)
+    
+    def take(self, order: list[int]) -> "ConversationFrame":
+        """Return a new frame holding the given rows, in the given order."""
+        frame = ConversationFrame()
+        frame.names = list(self.names)
+        frame._name_ids = dict(self._name_ids)
+        frame.timestamp_ms = array('q', [self.timestamp_ms[i] for i in order])
+        frame.sender_id = array('i', [self.sender_id[i] for i in order])
+        frame.type_code = array('B', [self.type_code[i] for i in order])
+        frame.content = [self.content[i] for i in order]
+        offsets = self.reaction_offsets
+        for i in order:
+            frame.reaction_actor.extend(self.reaction_actor[offsets[i]:offsets[i + 1]])
+            frame.reaction_emoji.extend(self.reaction_emoji[offsets[i]:offsets[i + 1]])
+            frame.reaction_offsets.append(len(frame.reaction_actor))
+        return frame
+    
+    def sorted(self) -> "ConversationFrame":
+        """Return the rows in chronological order (stable for equal timestamps)."""
+        return self.take(sorted(range(len(self)), key=self.timestamp_ms.__getitem__))
+    
+    def chronological(self) -> "ConversationFrame":
+        """Return the rows oldest first, rows with equal timestamps in file order.
+        
+        Facebook writes each file newest first, so the rows are reversed, except
+        within runs of equal timestamps; a full (stable) sort is only the
+        fallback for rows in neither order. All three ways give the order of
+        ``sorted``.
+        """
+        timestamps = self.timestamp_ms
+        if all(a <= b for a, b in zip(timestamps, islice(timestamps, 1, None))):
+            return self
+        if all(a >= b for a, b in zip(timestamps, islice(timestamps, 1, None))):
+            newest_first = groupby(range(len(self) - 1, -1, -1), key=timestamps.__getitem__)
+            return self.take([row for _, tied in newest_first for row in reversed(list(tied))])
+        return self.sorted()
+    
+    def timestamp(self, index: int) -> datetime:
+        """Local datetime of a row."""
+        return datetime.fromtimestamp(self.timestamp_ms[index] / 1000)
+    
+    def reactions(self, index: int) -> list[dict]:
+        """Reactions of a row, in the export's dict format."""
+        if index < 0:
+            index += len(self)
+        start, end = self.reaction_offsets[index], self.reaction_offsets[index + 1]
+        return [
+            {"reaction": emoji, "actor": self.names[actor] if actor >= 0 else ""}
+            for emoji, actor in zip(self.reaction_emoji[start:end], self.reaction_actor[start:end])
+        ]
+    
+    def __len__(self) -> int:
+        return len(self.timestamp_ms)
+    
+    def __getitem__(self, index: int | slice) -> Message | list[Message]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("message index out of range")
+        return Message(
+            sender=self.names[self.sender_id[index]],
+            content=self.content[index],
+            timestamp=self.timestamp(index),
+            message_type=MESSAGE_TYPES[self.type_code[index]],
+            reactions=self.reactions(index),
+            sender_id=self.sender_id[index],
+        )
+    
+    def __iter__(self) -> Iterator[Message]:
+        for index in range(len(self)):
+            yield self[index]
+
+
+def merge_frames(frames: list[ConversationFrame]) -> ConversationFrame:
+    """Merge chronological frames (see ``chronological``) into one.
+    
+    Frames covering disjoint time ranges - the usual message_N.json split -
+    are concatenated oldest range first; overlapping ones are combined with
+    a k-way heap merge. Either way no global sort is needed, and rows with
+    equal timestamps keep the order of ``frames``, as a stable sort of the
+    concatenated frames would.
+    """
+    merged = ConversationFrame()
+    runs = []
+    for frame in frames:
+        start = len(merged)
+        merged.extend(frame)
+        if len(merged) > start:
+            runs.append(range(start, len(merged)))
+    
+    timestamps = merged.timestamp_ms
+    # A run ending on the timestamp the next one starts with may only precede it if its frame does
+    by_start = sorted(runs, key=lambda run: timestamps[run[0]])
+    if all((timestamps[a[-1]], a[0]) < (timestamps[b[0]], b[0]) for a, b in zip(by_start, by_start[1:])):
+        order = [i for run in by_start for i in run]
+    else:
+        # heapq.merge yields equal keys in argument (frame) order
+        order = list(heapq.merge(*runs, key=timestamps.__getitem__))
+    
+    if order == list(range(len(merged))):
+        return merged
+    return merged.take(order)
+
+
+@dataclass
 class Conversation:
     """Represents a full conversation/group chat."""
     title: str
     participants: list[str]
-    messages: list[Message]
+    messages: ConversationFrame  # a list[Message] is converted on init
     
+    def __post_init__(self):
+        if not isinstance(self.messages, ConversationFrame):
+            self.messages = ConversationFrame.from_messages(self.messages)
+
+
+def _trie_pattern(phrases: list[str]) -> str:
+    """Regex alternation of phrases with shared prefixes factored out."""
+    trie: dict = {}
+    for phrase in phrases:
+        node = trie
+        for char in phrase:
+            node = node.setdefault(char, {})
+        node[""] = {}
+    
+    def build(node: dict) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        if len(branches) == 1 and "" not in node:
+            return branches[0]
+        # An optional group when a phrase ends here; greedy, so the longest wins
+        return "(?:" + "|".join(branches) + ")" + ("?" if "" in node else "")
+    
+    return build(trie)
+
+
+class PhraseClassifier:
+    """Classify text by the phrases it contains, in a single regex scan.
+    
+    All phrases of all types are compiled into one trie-shaped regex, so the
+    cost per message barely grows with the number of phrases or locales. When
+    a text contains phrases of several types, the type registered first wins.
+    """
+    
+    def __init__(self, phrases: dict[str, list[str]]):
+        self._phrases: dict[str, list[str]] = {}
+        for message_type, type_phrases in phrases.items():
+            self.add(message_type, type_phrases)
+    
+    def add(self, message_type: str, phrases: list[str]) -> None:
+        """Register more phrases for a message type and recompile."""
+        self._phrases.setdefault(message_type, []).extend(phrase.lower() for phrase in phrases)
+        self._priority = {message_type: rank for rank, message_type in enumerate(self._phrases)}
+        # Later registrations never override the type of an existing phrase
+        self._types: dict[str, str] = {}
+        for type_name, type_phrases in self._phrases.items():
+            for phrase in type_phrases:
+                self._types.setdefault(phrase, type_name)
+        # The regex reports the longest phrase at each position, but every
+        # phrase that is a prefix of it matches there too: the best type among
+        # them is what the position contributes
+        self._match_types = {
+            phrase: min(
+                (self._types[phrase[:end]] for end in range(1, len(phrase) + 1) if phrase[:end] in self._types),
+                key=self._priority.__getitem__
+            )
+            for phrase in self._types
+        }
+        self._pattern = re.compile(_trie_pattern(list(self._types))) if self._types else None
+    
+    def classify(self, text: str) -> str | None:
+        """Return the message type of the first-priority phrase in text, if any."""
+        if self._pattern is None:
+            return None
+        lower_text = text.lower()
+        match = self._pattern.search(lower_text)
+        best = None
+        while match:
+            message_type = self._match_types[match.group()]
+            if best is None or self._priority[message_type] < self._priority[best]:
+                best = message_type
+                if self._priority[best] == 0:
+                    break
+            match = self._pattern.search(lower_text, match.start() + 1)
+        return best
+
+
+# Built once at import time; the loader classifies every text message with it
+SYSTEM_MESSAGES = PhraseClassifier(SYSTEM_MESSAGE_PHRASES)
+
+
+def _repair_run(match: re.Match) -> str:
+    try:
+        return match.group().encode('latin-1').decode('utf-8')
+    except UnicodeDecodeError:
+        return match.group()
+
 
 def decode_facebook_encoding(text: str) -> str:
-    """Decode Facebook's weird encoding (UTF-8 stored as Latin-1)."""
+    """Decode Facebook's weird encoding (UTF-8 stored as Latin-1).
+    
+    ASCII strings, most of them, are returned as they are and a string that
+    is all mojibake is decoded in one go. Otherwise each run of U+0080-U+00FF
+    characters that forms valid UTF-8 is replaced with what it encodes.
+    """
     if text is None:
         return ""
+    if text.isascii():
+        return text
     try:
         return text.encode('latin-1').decode('utf-8')
     except (UnicodeDecodeError, UnicodeEncodeError):
-        return text
+        return _MOJIBAKE_RUN.sub(_repair_run, text)
+
 
+def decode_facebook_value(value: Any) -> Any:
+    """``decode_facebook_encoding`` applied to every string in a decoded JSON value."""
+    if isinstance(value, str):
+        return decode_facebook_encoding(value)
+    if isinstance(value, list):
+        return [decode_facebook_value(item) for item in value]
+    if isinstance(value, dict):
+        return {key: decode_facebook_value(item) for key, item in value.items()}
+    return value
 
-def parse_message(msg_data: dict) -> Message | None:
-    """Parse a single message from JSON data."""
+
+def _parse_fields(msg_data: dict) -> tuple[str, str, int, str, list[dict]] | None:
+    """Extract (sender, content, timestamp_ms, message_type, reactions) from JSON data."""
     sender = decode_facebook_encoding(msg_data.get("sender_name", "Unknown"))
-    timestamp = datetime.fromtimestamp(msg_data.get("timestamp_ms", 0) / 1000)
+    timestamp_ms = msg_data.get("timestamp_ms", 0)
     
     # Determine message type and content
     content = ""
@@ -47,25 +382,9 @@ def parse_message(msg_data: dict) -> Message | None:
     
     if "content" in msg_data:
         content = decode_facebook_encoding(msg_data["content"])
-        lower_content = content.lower()
         
-        # Check for group name changes
-        if any(phrase in lower_content for phrase in [
-            'named the group', 'changed the group name',
-            'nazwał grupę', 'nadał grupie nazwę', 'zmienił nazwę grupy',
-            'zmienił(-a) nazwę grupy', 'nadał(-a) grupie nazwę'
-        ]):
-            msg_type = "name_change"
-        # Check for group photo changes
-        elif any(phrase in lower_content for phrase in [
-            'changed the group photo', 'set the group photo',
-            'removed the group photo', 'zmienił zdjęcie grupy',
-            'ustawił zdjęcie grupy', 'usunął zdjęcie grupy',
-            'zmienił(-a) zdjęcie grupy'
-        ]):
-            msg_type = "photo_change"
-        else:
-            msg_type = "text"
+        # Check for group name and photo changes
+        msg_type = SYSTEM_MESSAGES.classify(content) or "text"
     elif "photos" in msg_data:
         msg_type = "photo"
         content = f"[{len(msg_data['photos'])} zdjęć]"
@@ -92,63 +411,286 @@ def parse_message(msg_data: dict) -> Message | None:
         # Skip system messages or messages without meaningful content
         return None
     
-    reactions = msg_data.get("reactions", [])
+    reactions = decode_facebook_value(msg_data.get("reactions", []))
     
-    return Message(
-        sender=sender,
-        content=content,
-        timestamp=timestamp,
-        message_type=msg_type,
-        reactions=reactions
-    )
+    return sender, content, timestamp_ms, msg_type, reactions
 
 
-def load_conversation(path: Path) -> Conversation:
-    """Load a conversation from a Facebook export directory or file."""
-    messages: list[Message] = []
-    title = "Conversation"
-    participants: list[str] = []
-    
+class _JsonStream:
+    """Incremental reader for a JSON document in a text file.
+
+    Values are decoded one at a time with ``json.JSONDecoder.raw_decode`` over a
+    sliding buffer, so a large top-level array can be walked element by element
+    without holding the whole document in memory.
+    """
+
+    def __init__(self, f: TextIO, chunk_size: int = STREAM_CHUNK_SIZE):
+        self._file = f
+        self._chunk_size = chunk_size
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+        self._decoder = json.JSONDecoder()
+
+    def _fill(self, size: int | None = None) -> bool:
+        """Read more data into the buffer, dropping the consumed prefix."""
+        if self._eof:
+            return False
+        chunk = self._file.read(size or self._chunk_size)
+        if not chunk:
+            self._eof = True
+            return False
+        self._buffer = self._buffer[self._pos:] + chunk
+        self._pos = 0
+        return True
+
+    def _peek(self) -> str:
+        """Skip whitespace and return the next character ('' at end of file)."""
+        while True:
+            self._pos = _WHITESPACE.match(self._buffer, self._pos).end()
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill():
+                return ""
+
+    def _expect(self, char: str) -> None:
+        found = self._peek()
+        if found != char:
+            raise ValueError(f"Malformed message file: expected {char!r}, got {found or 'end of file'!r}")
+        self._pos += 1
+
+    def value(self) -> Any:
+        """Decode the next complete JSON value."""
+        self._peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                # Value is cut off by the end of the buffer - grow it geometrically
+                if not self._fill(max(self._chunk_size, len(self._buffer) - self._pos)):
+                    raise
+                continue
+            # Numbers and literals may continue past the end of the buffer: a
+            # number cut after "-1." or "1e" decodes as its shorter prefix, so
+            # it is complete only once a delimiter follows it
+            cut_short = end == len(self._buffer) or (
+                isinstance(value, (int, float)) and not isinstance(value, bool)
+                and not _VALUE_END.search(self._buffer, end)
+            )
+            if cut_short and self._fill():
+                continue
+            self._pos = end
+            return value
+
+    def _separator(self, closing: str) -> bool:
+        """Consume a ',' or the closing bracket; return True when closed."""
+        char = self._peek()
+        self._pos += 1
+        if char == closing:
+            return True
+        if char != ",":
+            raise ValueError(f"Malformed message file: expected ',' or {closing!r}, got {char or 'end of file'!r}")
+        return False
+
+    def keys(self) -> Iterator[str]:
+        """Yield keys of the object at the cursor; the caller must consume each value."""
+        self._expect("{")
+        if self._peek() == "}":
+            self._pos += 1
+            return
+        while True:
+            key = self.value()
+            self._expect(":")
+            yield key
+            if self._separator("}"):
+                return
+
+    def items(self) -> Iterator[Any]:
+        """Yield decoded elements of the array at the cursor."""
+        self._expect("[")
+        if self._peek() == "]":
+            self._pos += 1
+            return
+        while True:
+            yield self.value()
+            if self._separator("]"):
+                return
+
+
+def _iter_file_data(file_path: Path, header: dict | None = None) -> Iterator[dict]:
+    """Stream the raw message dicts of a message_N.json file.
+
+    The "messages" array is decoded one element at a time. Every other top-level
+    field (title, participants, ...) is stored in ``header`` when given; Facebook
+    writes them after the messages, so they are complete once iteration ends.
+    """
+    with file_path.open('r', encoding='utf-8') as f:
+        stream = _JsonStream(f)
+        for key in stream.keys():
+            if key == "messages":
+                yield from stream.items()
+            else:
+                value = stream.value()
+                if header is not None:
+                    header[key] = value
+
+
+def scan_message_file(file_path: Path) -> tuple[dict[str, Any], int, int]:
+    """Read a message file's top-level fields, message count and newest timestamp.
+
+    Only the fields other than "messages" are decoded (with mojibake repaired).
+    Messages are counted by their "timestamp_ms" keys without being built, and
+    the first one is the newest since Facebook writes each file newest first.
+    Files not in Facebook's indented layout are decoded in full.
+    """
+    with file_path.open('rb') as f:
+        data = f.read()
+
+    keys = list(_TOP_LEVEL_KEY.finditer(data))
+    if not keys:
+        header = decode_facebook_value(json.loads(data.decode('utf-8')))
+        messages = header.pop("messages", [])
+        timestamps = [msg.get("timestamp_ms", 0) for msg in messages]
+        return header, len(messages), max(timestamps, default=0)
+
+    decoder = json.JSONDecoder()
+    header: dict[str, Any] = {}
+    for match, next_match in zip(keys, keys[1:] + [None]):
+        key = match.group(1).decode('utf-8')
+        if key != "messages":
+            # The slice runs up to the next key; raw_decode ignores what follows the value
+            value = data[match.end():next_match.start() if next_match else len(data)]
+            header[key] = decode_facebook_value(decoder.raw_decode(value.decode('utf-8'))[0])
+    newest = _TIMESTAMP_MS.search(data)
+    return header, data.count(b'"timestamp_ms"'), int(newest.group(1)) if newest else 0
+
+
+def find_message_files(path: Path) -> list[Path]:
+    """Find the message_*.json files for a conversation file or directory.
+
+    ``path`` may also be a folder inside a ZIP export (see ``archive``).
+    """
     # Handle both single file and directory with multiple message_X.json files
     if path.is_file():
-        files = [path]
-    else:
-        # Look for message_*.json files in the directory
-        files = sorted(path.glob("message_*.json"))
-        if not files:
-            # Maybe it's in a subdirectory
-            for subdir in path.iterdir():
-                if subdir.is_dir():
-                    files = sorted(subdir.glob("message_*.json"))
-                    if files:
-                        break
+        return [path]
     
+    # Look for message_*.json files in the directory
+    files = sorted(path.glob("message_*.json"))
     if not files:
-        raise ValueError(f"No message files found in {path}")
+        # Maybe it's in a subdirectory
+        for subdir in path.iterdir():
+            if subdir.is_dir():
+                files = sorted(subdir.glob("message_*.json"))
+                if files:
+                    break
+    return files
+
+
+def _load_file(file_path: Path) -> tuple[dict[str, Any], ConversationFrame]:
+    """Parse one message file into its metadata and a chronological frame (pool worker)."""
+    header: dict[str, Any] = {}
+    frame = ConversationFrame()
+    for msg_data in _iter_file_data(file_path, header):
+        fields = _parse_fields(msg_data)
+        if fields:
+            frame.append(*fields)
+    metadata = {key: decode_facebook_value(header[key]) for key in ("title", "participants") if key in header}
+    return metadata, frame.chronological()
+
+
+def _assemble_conversation(loaded: Iterable[tuple[dict[str, Any], ConversationFrame]]) -> Conversation:
+    """Build a conversation from the parsed message files, in file order."""
+    file_frames: list[ConversationFrame] = []
+    title = "Conversation"
+    participants: list[str] = []
     
-    for file_path in files:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+    for header, file_frame in loaded:
+        file_frames.append(file_frame)
         
         # Get metadata from first file
         if not participants:
-            title = decode_facebook_encoding(data.get("title", "Conversation"))
-            participants = [
-                decode_facebook_encoding(p.get("name", "Unknown"))
-                for p in data.get("participants", [])
-            ]
-        
-        # Parse messages
-        for msg_data in data.get("messages", []):
-            msg = parse_message(msg_data)
-            if msg:
-                messages.append(msg)
+            title = header.get("title", "Conversation") or ""
+            participants = [p.get("name", "Unknown") or "" for p in header.get("participants", [])]
     
-    # Sort messages by timestamp (oldest first)
-    messages.sort(key=lambda m: m.timestamp)
+    # Merge the per-file runs by timestamp (oldest first)
+    frame = merge_frames(file_frames)
     
     return Conversation(
         title=title,
         participants=participants,
-        messages=messages
+        messages=frame
     )
+
+
+def load_conversation(path: Path, jobs: int = 1, cache_dir: Path | None = None) -> Conversation:
+    """Load a conversation from a Facebook export directory or file.
+    
+    With ``jobs`` > 1 the message files are parsed in a process pool
+    (``jobs=0`` uses every CPU). Each file is put in chronological order on
+    its own and the files are then merged (see ``merge_frames``).
+    With ``cache_dir`` set, a columnar snapshot of the parsed conversation is
+    reused while the message files are unchanged (see ``cache.py``).
+    """
+    files = find_message_files(path)
+    if not files:
+        raise ValueError(f"No message files found in {path}")
+    
+    if cache_dir is not None:
+        from .cache import load_cached_conversation
+        cached = load_cached_conversation(files, cache_dir)
+        if cached is not None:
+            return cached
+    
+    if jobs <= 0:
+        jobs = os.cpu_count() or 1
+    
+    pool = None
+    if jobs > 1 and len(files) > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        pool = ProcessPoolExecutor(max_workers=min(jobs, len(files)))
+    try:
+        # Parse messages, streaming them out of each file one at a time
+        loaded = pool.map(_load_file, files) if pool else map(_load_file, files)
+        conversation = _assemble_conversation(loaded)
+    finally:
+        if pool:
+            pool.shutdown()
+    
+    if cache_dir is not None:
+        from .cache import save_cached_conversation
+        save_cached_conversation(conversation, files, cache_dir)
+    
+    return conversation
+
+
+class IncrementalLoader:
+    """Reload a conversation, re-parsing only the message files that changed.
+
+    Each parsed file is kept with its size and mtime. ``load`` parses new and
+    modified files, forgets deleted ones and merges all of them again.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._parsed: dict[Path, tuple[tuple[int, int], dict[str, Any], ConversationFrame]] = {}
+
+    def load(self) -> tuple[Conversation, list[Path]]:
+        """Return the current conversation and the files parsed for it."""
+        files = find_message_files(self.path)
+        if not files:
+            raise ValueError(f"No message files found in {self.path}")
+        
+        reparsed = []
+        parsed = {}
+        for file_path in files:
+            stat = file_path.stat()
+            fingerprint = (stat.st_size, stat.st_mtime_ns)
+            entry = self._parsed.get(file_path)
+            if entry is None or entry[0] != fingerprint:
+                entry = (fingerprint, *_load_file(file_path))
+                reparsed.append(file_path)
+            parsed[file_path] = entry
+        self._parsed = parsed
+        
+        conversation = _assemble_conversation((header, frame) for _, header, frame in parsed.values())
+        return conversation, reparsed
@@ -0,0 +1,127 @@
+"""Stage timing for the CLI's --profile option.
+
+A ``Profiler`` records the wall time, CPU time and memory of named stages.
+Stages nest; inside a stage, ``lap`` closes one sub-stage and opens the next,
+which suits long sequential functions such as ``analyze_conversation``. A lap
+can also carry the wall time its subject spent earlier, interleaved with other
+work, such as a category's share of the shared message loop.
+
+CPU time includes worker processes once they have been joined. Memory is the
+process's peak resident set size at the end of a stage and how much the stage
+raised it; unlike tracemalloc this costs nothing, so profiled runs keep their
+normal speed.
+"""
+
+import cProfile
+import sys
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterator
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def _cpu_time() -> float:
+    """CPU seconds used by this process and its joined children."""
+    if resource is None:
+        return time.process_time()
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return time.process_time() + children.ru_utime + children.ru_stime
+
+
+def _peak_rss() -> int:
+    """Peak resident set size of this process in bytes (0 if unknown)."""
+    if resource is None:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+@dataclass
+class StageTiming:
+    """Measurements of one stage."""
+    name: str
+    depth: int
+    wall: float = 0.0
+    cpu: float = 0.0
+    peak_rss: int = 0
+    rss_growth: int = 0
+    # Wall time spent on this stage's behalf in the message scan, if measured
+    scan: float | None = None
+    children: list["StageTiming"] = field(default_factory=list)
+
+
+class Profiler:
+    """Collects stage timings, and optionally a cProfile of the whole run."""
+
+    def __init__(self, pstats_path: Path | None = None):
+        self.stages: list[StageTiming] = []
+        self.pstats_path = pstats_path
+        # Running stages, innermost last, with their start measurements
+        self._open: list[tuple[StageTiming, float, float, int]] = []
+        self._lap: tuple[StageTiming, float, float, int] | None = None
+        self._cprofile = cProfile.Profile() if pstats_path else None
+        if self._cprofile:
+            self._cprofile.enable()
+
+    @staticmethod
+    def _start(stage: StageTiming) -> tuple[StageTiming, float, float, int]:
+        return stage, time.perf_counter(), _cpu_time(), _peak_rss()
+
+    @staticmethod
+    def _close(stage: StageTiming, wall_start: float, cpu_start: float, rss_start: int) -> None:
+        stage.wall = time.perf_counter() - wall_start
+        stage.cpu = _cpu_time() - cpu_start
+        stage.peak_rss = _peak_rss()
+        stage.rss_growth = stage.peak_rss - rss_start
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[StageTiming]:
+        """Measure the enclosed block as a stage."""
+        self._end_lap()
+        stage = StageTiming(name, depth=len(self._open))
+        (self._open[-1][0].children if self._open else self.stages).append(stage)
+        self._open.append(self._start(stage))
+        try:
+            yield stage
+        finally:
+            self._end_lap()
+            self._close(*self._open.pop())
+
+    def lap(self, name: str, scan: float | None = None) -> None:
+        """End the current lap of the innermost stage and start one called ``name``.
+
+        ``scan`` is the time the lap's subject already spent in the message scan.
+        """
+        if not self._open:
+            return
+        self._end_lap()
+        parent = self._open[-1][0]
+        stage = StageTiming(name, depth=parent.depth + 1, scan=scan)
+        parent.children.append(stage)
+        self._lap = self._start(stage)
+
+    def _end_lap(self) -> None:
+        if self._lap:
+            self._close(*self._lap)
+            self._lap = None
+
+    def finish(self) -> None:
+        """Stop profiling and write the pstats file, if one was requested."""
+        if self._cprofile:
+            self._cprofile.disable()
+            self._cprofile.dump_stats(str(self.pstats_path))
+
+    def iter_stages(self) -> Iterator[StageTiming]:
+        """All stages depth-first, in the order they ran."""
+        def walk(stages: list[StageTiming]) -> Iterator[StageTiming]:
+            for stage in stages:
+                yield stage
+                yield from walk(stage.children)
+        return walk(self.stages)
@@ -0,0 +1,231 @@
+"""Serve the Wrapped reports of every chat in an export over HTTP.
+
+``/`` lists the chats found by discovery and ``/chat/<folder>`` shows one
+chat's report. A chat is analyzed on its first request; the analysis and the
+rendered page are then kept in a ``ReportCache`` (least recently used first
+out, within a memory budget).
+
+Reports carry a weak ETag derived from the names, sizes and mtimes of the
+chat's message files, so a browser revalidating an unchanged report gets a
+304 without the chat being loaded, and a changed export yields a new report.
+"""
+
+import hashlib
+import sys
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import fields, is_dataclass
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable
+from urllib.parse import unquote
+
+from .analyzer import AnalysisResult, analyze_conversation
+from .generator import render_html, render_index_html
+from .parser import find_message_files, load_conversation
+
+
+# Memory budget of the report cache, in bytes
+DEFAULT_MEMORY_LIMIT = 256 * 2**20
+
+# Shortest time between two rediscoveries of the chats, in seconds
+REFRESH_INTERVAL = 10.0
+
+
+def approximate_size(obj: Any) -> int:
+    """Rough memory footprint of an object and everything it references."""
+    seen = set()
+    stack = [obj]
+    size = 0
+    while stack:
+        item = stack.pop()
+        if id(item) in seen:
+            continue
+        seen.add(id(item))
+        size += sys.getsizeof(item)
+        if isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset)):
+            stack.extend(item)
+        elif is_dataclass(item):
+            stack.extend(getattr(item, f.name) for f in fields(item))
+    return size
+
+
+def report_etag(files: list[Path]) -> str:
+    """Weak ETag of a chat's report, from its message files' paths, sizes and mtimes."""
+    digest = hashlib.sha1()
+    for file_path in files:
+        stat = file_path.stat()
+        digest.update(f"{file_path}\0{stat.st_size}\0{stat.st_mtime_ns}\n".encode("utf-8"))
+    return f'W/"{digest.hexdigest()}"'
+
+
+class ReportCache:
+    """Analyses and rendered reports by ETag, evicting the least recently used.
+
+    Entries are dropped once their total approximate size exceeds
+    ``memory_limit`` bytes; the most recent entry is always kept.
+    """
+
+    def __init__(self, memory_limit: int = DEFAULT_MEMORY_LIMIT):
+        self.memory_limit = memory_limit
+        self.size = 0
+        self._entries: OrderedDict[str, tuple[AnalysisResult, bytes, int]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, etag: str) -> tuple[AnalysisResult, bytes] | None:
+        with self._lock:
+            entry = self._entries.get(etag)
+            if entry is None:
+                return None
+            self._entries.move_to_end(etag)
+            return entry[0], entry[1]
+
+    def put(self, etag: str, result: AnalysisResult, page: bytes) -> None:
+        entry_size = approximate_size(result) + len(page)
+        with self._lock:
+            old = self._entries.pop(etag, None)
+            if old is not None:
+                self.size -= old[2]
+            self._entries[etag] = (result, page, entry_size)
+            self.size += entry_size
+            while self.size > self.memory_limit and len(self._entries) > 1:
+                _, (_, _, evicted_size) = self._entries.popitem(last=False)
+                self.size -= evicted_size
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class ReportServer(ThreadingHTTPServer):
+    """HTTP server holding the chat list and the report cache."""
+
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], discover: Callable[[], list[dict]],
+                 memory_limit: int = DEFAULT_MEMORY_LIMIT, cache_dir: Path | None = None):
+        super().__init__(address, ReportHandler)
+        self.discover = discover
+        self.cache_dir = cache_dir
+        self.reports = ReportCache(memory_limit)
+        self.chats: dict[str, dict] = {}
+        self._chat_list: list[dict] = []
+        self._refreshed_at: float | None = None
+        # Held for a whole rediscovery, so concurrent requests never run two
+        self._refresh_lock = threading.Lock()
+        # One lock per report being built, so concurrent requests analyze a chat once
+        self._building: dict[str, threading.Lock] = {}
+        self._building_lock = threading.Lock()
+
+    def refresh_chats(self) -> list[dict]:
+        """Rediscover the chats, at most once per ``REFRESH_INTERVAL``.
+        
+        Within the interval, or after waiting for a rediscovery another
+        request started, the current chat list is returned as it is.
+        """
+        with self._refresh_lock:
+            now = time.monotonic()
+            if self._refreshed_at is None or now - self._refreshed_at >= REFRESH_INTERVAL:
+                chats = self.discover()
+                self.chats = {chat_info["path"].name: chat_info for chat_info in chats}
+                self._chat_list = chats
+                self._refreshed_at = time.monotonic()
+            return self._chat_list
+
+    def find_chat(self, folder: str) -> dict | None:
+        chat_info = self.chats.get(folder)
+        if chat_info is None:
+            chat_info = next((c for c in self.refresh_chats() if c["path"].name == folder), None)
+        return chat_info
+
+    def report(self, chat_path: Path, etag: str) -> bytes:
+        """The rendered report for a chat, analyzing it unless cached."""
+        cached = self.reports.get(etag)
+        if cached is not None:
+            return cached[1]
+        with self._building_lock:
+            lock = self._building.setdefault(etag, threading.Lock())
+        try:
+            with lock:
+                cached = self.reports.get(etag)
+                if cached is not None:
+                    return cached[1]
+                conversation = load_conversation(chat_path, cache_dir=self.cache_dir)
+                result = analyze_conversation(conversation)
+                page = render_html(result).encode("utf-8")
+                self.reports.put(etag, result, page)
+                return page
+        finally:
+            with self._building_lock:
+                self._building.pop(etag, None)
+
+
+class ReportHandler(BaseHTTPRequestHandler):
+    """Serves the chat index and the chat reports."""
+
+    server: ReportServer
+
+    def do_GET(self) -> None:
+        path = self.path.split("?", 1)[0]
+        if path in ("/", "/index.html"):
+            self._send_index()
+        elif path.startswith("/chat/"):
+            self._send_chat(unquote(path.removeprefix("/chat/")))
+        else:
+            self.send_error(HTTPStatus.NOT_FOUND)
+
+    def _send_index(self) -> None:
+        page = render_index_html([
+            {
+                "title": chat_info["title"],
+                "file": f"chat/{chat_info['path'].name}",
+                "message_count": chat_info["message_count"],
+                "participant_count": chat_info["participant_count"],
+                "last_message": chat_info["last_message"],
+            }
+            for chat_info in self.server.refresh_chats()
+        ]).encode("utf-8")
+        self._send_page(page, f'"{hashlib.sha1(page).hexdigest()}"')
+
+    def _send_chat(self, folder: str) -> None:
+        chat_info = self.server.find_chat(folder)
+        if chat_info is None:
+            self.send_error(HTTPStatus.NOT_FOUND, f"No chat {folder!r}")
+            return
+        try:
+            etag = report_etag(find_message_files(chat_info["path"]))
+            if self._not_modified(etag):
+                return
+            page = self.server.report(chat_info["path"], etag)
+        except Exception as e:
+            self.send_error(HTTPStatus.INTERNAL_SERVER_ERROR, str(e))
+            return
+        self._send_page(page, etag)
+
+    def _not_modified(self, etag: str) -> bool:
+        """Answer 304 if the client already holds this version."""
+        if_none_match = self.headers.get("If-None-Match", "")
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        if etag.removeprefix("W/") not in tags and "*" not in tags:
+            return False
+        self.send_response(HTTPStatus.NOT_MODIFIED)
+        self.send_header("ETag", etag)
+        self.end_headers()
+        return True
+
+    def _send_page(self, page: bytes, etag: str) -> None:
+        if self._not_modified(etag):
+            return
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(page)))
+        self.send_header("ETag", etag)
+        # Always revalidate, so an updated export is picked up on reload
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        self.wfile.write(page)
+
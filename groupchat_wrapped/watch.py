@@ -0,0 +1,141 @@
+"""Watch a chat folder for changes to its message files.
+
+On Linux the folder is watched with inotify (through ctypes, no extra
+dependency); elsewhere, or if inotify is unavailable, the message files'
+sizes and mtimes are polled.
+"""
+
+import ctypes
+import ctypes.util
+import fnmatch
+import os
+import select
+import struct
+import sys
+import time
+from pathlib import Path
+
+
+MESSAGE_FILE_PATTERN = "message_*.json"
+
+# Seconds between scans when polling
+POLL_INTERVAL = 1.0
+
+# inotify constants from <sys/inotify.h>
+_IN_MODIFY = 0x002
+_IN_ATTRIB = 0x004
+_IN_CLOSE_WRITE = 0x008
+_IN_MOVED_FROM = 0x040
+_IN_MOVED_TO = 0x080
+_IN_CREATE = 0x100
+_IN_DELETE = 0x200
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+# Attribute changes count too: a new mtime is a change to the loader
+_IN_MASK = _IN_MODIFY | _IN_ATTRIB | _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE
+
+# struct inotify_event: wd, mask, cookie, len, then len bytes of name
+_EVENT = struct.Struct("iIII")
+
+
+class PollingWatcher:
+    """Detects changes by comparing the message files' sizes and mtimes."""
+
+    def __init__(self, folder: Path, poll_interval: float = POLL_INTERVAL):
+        self.folder = folder
+        self.poll_interval = poll_interval
+        self._snapshot = self._scan()
+
+    def _scan(self) -> dict[str, tuple[int, int]]:
+        snapshot = {}
+        try:
+            with os.scandir(self.folder) as entries:
+                for entry in entries:
+                    if fnmatch.fnmatch(entry.name, MESSAGE_FILE_PATTERN):
+                        stat = entry.stat()
+                        snapshot[entry.name] = (stat.st_size, stat.st_mtime_ns)
+        except OSError:
+            pass
+        return snapshot
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """Block until a message file changes; False if ``timeout`` passes first."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                return False
+            time.sleep(self.poll_interval if remaining is None else min(self.poll_interval, remaining))
+            snapshot = self._scan()
+            if snapshot != self._snapshot:
+                self._snapshot = snapshot
+                return True
+
+    def close(self) -> None:
+        pass
+
+
+class InotifyWatcher:
+    """Detects changes from inotify events on the folder (Linux only)."""
+
+    def __init__(self, folder: Path):
+        self.folder = folder
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._fd = libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        if libc.inotify_add_watch(self._fd, os.fsencode(folder), _IN_MASK) < 0:
+            errno = ctypes.get_errno()
+            os.close(self._fd)
+            raise OSError(errno, f"inotify_add_watch failed for {folder}")
+
+    def _read_changes(self) -> bool:
+        """Drain pending events; True if any concerns a message file."""
+        changed = False
+        while True:
+            try:
+                data = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                return changed
+            offset = 0
+            while offset < len(data):
+                _, _, _, name_length = _EVENT.unpack_from(data, offset)
+                offset += _EVENT.size
+                name = data[offset:offset + name_length].rstrip(b"\0").decode(errors="replace")
+                offset += name_length
+                changed = changed or fnmatch.fnmatch(name, MESSAGE_FILE_PATTERN)
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """Block until a message file changes; False if ``timeout`` passes first."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            ready, _, _ = select.select([self._fd], [], [], remaining)
+            if ready and self._read_changes():
+                return True
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+
+    def close(self) -> None:
+        os.close(self._fd)
+
+
+def open_watcher(folder: Path, poll_interval: float = POLL_INTERVAL) -> InotifyWatcher | PollingWatcher:
+    """Watch a folder with inotify where available, polling otherwise."""
+    if sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(folder)
+        except (OSError, AttributeError):
+            pass
+    return PollingWatcher(folder, poll_interval)
+
+
+def wait_for_changes(watcher: InotifyWatcher | PollingWatcher, debounce: float) -> None:
+    """Block until message files change and then stay quiet for ``debounce`` seconds.
+
+    A burst of writes - an export being copied in file by file - thus
+    triggers a single rebuild.
+    """
+    watcher.wait()
+    while watcher.wait(debounce):
+        pass